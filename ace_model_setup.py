@@ -1,15 +1,26 @@
 from __future__ import annotations
 
 from pathlib import Path
+import functools
+import mmap
+import os
 import sys
-from typing import Optional, Callable
+import threading
+import time
+import weakref
+from typing import Callable, List, Optional, Tuple
 
-from huggingface_hub import snapshot_download
 import cdmf_paths
 
 # Hugging Face repo for ACE-Step
 ACE_REPO_ID = "ACE-Step/ACE-Step-v1-3.5B"
 
+# Parallel download tuning. The ACE-Step repo is several GB spread over a
+# handful of large shards, so a single connection leaves most of the CDN
+# bandwidth unused.
+DOWNLOAD_MAX_WORKERS = min(16, (os.cpu_count() or 4) * 2)
+DOWNLOAD_ETAG_TIMEOUT = 30
+
 def get_ace_checkpoint_root() -> Path:
     """
     Get the root folder for ACE-Step checkpoints based on user configuration.
@@ -19,27 +30,49 @@ def get_ace_checkpoint_root() -> Path:
         models--ACE-Step--ACE-Step-v1-3.5B/
           snapshots/<rev-hash>/
     """
-    models_folder = cdmf_paths.get_models_folder()
-    checkpoint_root = models_folder / "checkpoints"
-    checkpoint_root.mkdir(parents=True, exist_ok=True)
-    return checkpoint_root
+    return _checkpoint_root_for(cdmf_paths.get_models_folder())
+
 
 # Name HF uses for the repo under the cache root
 ACE_LOCAL_DIRNAME = "models--ACE-Step--ACE-Step-v1-3.5B"
 
+
+@functools.lru_cache(maxsize=8)
+def _checkpoint_root_for(models_folder: Path) -> Path:
+    # Keyed on the models folder so a change in Settings still gets its own
+    # (created) checkpoint root; repeat calls skip the mkdir syscalls.
+    checkpoint_root = models_folder / "checkpoints"
+    checkpoint_root.mkdir(parents=True, exist_ok=True)
+    return checkpoint_root
+
 ProgressCallback = Callable[[float], None]
 
 
+# Minimum seconds between progress callbacks (~20 Hz).
+_PROGRESS_MIN_INTERVAL = 0.05
+
+
 def _build_tqdm_with_progress_cb(progress_cb: ProgressCallback):
     """
     Build a tqdm subclass that forwards overall progress [0, 1] to
     the given callback. Used so the Flask UI can show real download progress.
+
+    update() fires per chunk from every download worker, so callbacks are
+    rate-limited and the fraction is aggregated across all live bars to
+    report one monotonic value instead of per-file flapping.
     """
     from tqdm.auto import tqdm as base_tqdm
 
     class HFProgressTqdm(base_tqdm):
+        _lock = threading.Lock()
+        _live: "weakref.WeakSet[HFProgressTqdm]" = weakref.WeakSet()
+        _last_emit = 0.0
+        _last_frac = 0.0
+
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
+            with HFProgressTqdm._lock:
+                HFProgressTqdm._live.add(self)
             # Initial ping at 0%
             try:
                 progress_cb(0.0)
@@ -49,11 +82,22 @@ def _build_tqdm_with_progress_cb(progress_cb: ProgressCallback):
         def update(self, n=1):
             res = super().update(n)
             try:
-                total = float(self.total or 0.0)
-                if total > 0:
-                    frac = float(self.n) / total
-                    frac = max(0.0, min(1.0, frac))
-                    progress_cb(frac)
+                now = time.monotonic()
+                cls = HFProgressTqdm
+                with cls._lock:
+                    done = total = 0.0
+                    for bar in list(cls._live):
+                        if bar.total:
+                            done += float(bar.n)
+                            total += float(bar.total)
+                    if total <= 0:
+                        return res
+                    frac = max(cls._last_frac, min(1.0, done / total))
+                    if frac < 1.0 and now - cls._last_emit < _PROGRESS_MIN_INTERVAL:
+                        return res
+                    cls._last_emit = now
+                    cls._last_frac = frac
+                progress_cb(frac)
             except Exception:
                 # Never let progress reporting break the download
                 pass
@@ -62,35 +106,284 @@ def _build_tqdm_with_progress_cb(progress_cb: ProgressCallback):
     return HFProgressTqdm
 
 
+def _enable_hf_transfer() -> bool:
+    """
+    Turn on hf_transfer (multi-connection Rust downloader) when it is installed.
+    Set HF_HUB_ENABLE_HF_TRANSFER=0 in the environment to opt out.
+    """
+    if os.environ.get("HF_HUB_ENABLE_HF_TRANSFER", "").strip() == "0":
+        return False
+    try:
+        import hf_transfer  # noqa: F401
+    except ImportError:
+        return False
+
+    os.environ["HF_HUB_ENABLE_HF_TRANSFER"] = "1"
+    # huggingface_hub reads the env var once at import time; update the
+    # already-imported constant as well so this call actually uses it.
+    try:
+        from huggingface_hub import constants as hf_constants
+        hf_constants.HF_HUB_ENABLE_HF_TRANSFER = True
+    except Exception:
+        pass
+    return True
+
+
+def _list_repo_files() -> List[Tuple[str, int]]:
+    """(filename, size_bytes) for every file in the ACE-Step repo (network call)."""
+    from huggingface_hub import HfApi
+
+    info = HfApi().model_info(ACE_REPO_ID, files_metadata=True)
+    return [(s.rfilename, int(s.size or 0)) for s in (info.siblings or [])]
+
+
+def _download_files_parallel(files: List[Tuple[str, int]], target_dir: Path) -> None:
+    """
+    Fetch each repo file with hf_hub_download on its own worker. Largest
+    files are submitted first so the multi-GB shards start immediately
+    instead of queueing behind config/tokenizer files; total wall time is
+    then bounded by the biggest shard rather than the sum.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from huggingface_hub import hf_hub_download
+
+    ordered = sorted(files, key=lambda f: f[1], reverse=True)
+    ex = ThreadPoolExecutor(
+        max_workers=max(1, min(DOWNLOAD_MAX_WORKERS, len(ordered))),
+        thread_name_prefix="ACEDownload",
+    )
+    try:
+        futures = [
+            ex.submit(
+                hf_hub_download,
+                repo_id=ACE_REPO_ID,
+                filename=name,
+                local_dir=str(target_dir),
+                etag_timeout=DOWNLOAD_ETAG_TIMEOUT,
+            )
+            for name, _size in ordered
+        ]
+        for fut in as_completed(futures):
+            fut.result()
+    except BaseException:
+        ex.shutdown(wait=False, cancel_futures=True)
+        raise
+    else:
+        ex.shutdown(wait=True)
+
+
+def _dir_size_bytes(root: Path) -> int:
+    total = 0
+    for dirpath, _dirnames, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+def _start_dir_size_progress(
+    target_dir: Path,
+    expected_bytes: int,
+    progress_cb: ProgressCallback,
+    interval: float = 0.5,
+) -> threading.Event:
+    """
+    Report progress by polling the size of `target_dir` against the expected
+    repo size. Per-file downloads (and hf_transfer, which streams shards in
+    Rust) give no byte-level tqdm we can aggregate; polling bytes on disk
+    gives a smooth bar instead.
+    Returns an Event; set it to stop polling.
+    """
+    stop = threading.Event()
+
+    def _poll():
+        while not stop.wait(interval):
+            try:
+                frac = _dir_size_bytes(target_dir) / float(expected_bytes)
+                progress_cb(max(0.0, min(1.0, frac)))
+            except Exception:
+                pass
+
+    threading.Thread(target=_poll, daemon=True, name="ACEDownloadProgress").start()
+    return stop
+
+
+# Weight/tokenizer files the pipeline reads at load time.
+_WARM_SUFFIXES = {".safetensors", ".bin", ".json", ".model"}
+_WARM_CHUNK = 1 << 20
+
+
+def _madvise_willneed(path: Path) -> bool:
+    """
+    mmap the file and advise MADV_WILLNEED so the kernel pages it in
+    asynchronously (no userspace copy). Not MADV_SEQUENTIAL: weights are
+    re-read during inference and sequential advice would evict them.
+    Returns False when unsupported so the caller can fall back.
+    """
+    if not hasattr(mmap, "MADV_WILLNEED"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return True
+        with mmap.mmap(fd, 0, prot=mmap.PROT_READ) as mm:
+            mm.madvise(mmap.MADV_WILLNEED)
+        return True
+    finally:
+        os.close(fd)
+
+
+def _warm_file(path: Path) -> None:
+    if path.suffix == ".safetensors" and _madvise_willneed(path):
+        return
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "posix_fadvise"):
+            # Kick off kernel readahead without copying through userspace.
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            return
+        while f.read(_WARM_CHUNK):
+            pass
+
+
+def warm_page_cache(root: Path, workers: int = 16) -> None:
+    """
+    Pull the model's weight and tokenizer files into the OS page cache
+    concurrently, so the (sequential) pipeline load afterwards reads from
+    memory instead of waiting on disk one shard at a time. Best effort.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    try:
+        files = [
+            p for p in Path(root).rglob("*")
+            if p.suffix in _WARM_SUFFIXES and p.is_file()
+        ]
+    except OSError:
+        return
+    if not files:
+        return
+
+    def _safe_warm(p: Path) -> None:
+        try:
+            _warm_file(p)
+        except OSError:
+            pass
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(files)))) as ex:
+        list(ex.map(_safe_warm, files))
+
+
 def _ace_repo_dir() -> Path:
     """
     Directory where Hugging Face will place the ACE-Step repo
     under our checkpoint root.
     """
-    checkpoint_root = get_ace_checkpoint_root()
+    return _repo_dir_for(get_ace_checkpoint_root())
+
+
+@functools.lru_cache(maxsize=8)
+def _repo_dir_for(checkpoint_root: Path) -> Path:
     return checkpoint_root / ACE_LOCAL_DIRNAME
 
 
-def ace_models_present() -> bool:
+# Text-encoder weights: the one file named "model.safetensors" in the repo.
+_ACE_MARKER_FILE = "model.safetensors"
+_ACE_MARKER_RELPATH = Path("umt5-base") / _ACE_MARKER_FILE
+
+
+def _iter_files_named(root: Path, name: str):
     """
-    Lightweight check: treat the model as present if we can find at least
-    one *.safetensors weight file anywhere under the checkpoint root,
-    without triggering any network downloads.
+    Yield paths of files called `name` under `root`, depth-first via
+    os.scandir. Lazy, so callers can stop at the first hit; skips the HF
+    blobs/ store (hash-named files only) and hidden download scratch dirs.
     """
-    root = get_ace_checkpoint_root()
-    if not root.is_dir():
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != "blobs" and not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.name == name:
+                        yield Path(entry.path)
+        except OSError:
+            continue
+
+
+def _dir_has_entries(path: Path) -> bool:
+    """True if `path` is a directory with at least one entry (stops at the first)."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except OSError:
+        # Missing, not a directory, or unreadable
         return False
 
+
+def ace_models_present() -> bool:
+    """
+    Lightweight check: treat the model as present if the repo dir contains
+    a model.safetensors weight file, without triggering any network
+    downloads. Known locations are probed first; the directory walk stops
+    at the first match.
+    """
     repo_dir = _ace_repo_dir()
-    if repo_dir.is_dir():
-        for p in repo_dir.rglob("model.safetensors"):
-            return True
+    if not repo_dir.is_dir():
+        return False
 
-    # Fallback: catch any older layouts just in case
-    for p in root.rglob("model.safetensors"):
+    # local_dir layout (what ensure_ace_models produces)
+    if (repo_dir / _ACE_MARKER_RELPATH).is_file():
         return True
 
-    return False
+    # HF cache layout: snapshots/<rev>/umt5-base/model.safetensors
+    snapshots = repo_dir / "snapshots"
+    if snapshots.is_dir():
+        with os.scandir(snapshots) as it:
+            for snap in it:
+                if os.path.isfile(os.path.join(snap.path, _ACE_MARKER_RELPATH)):
+                    return True
+
+    return next(_iter_files_named(repo_dir, _ACE_MARKER_FILE), None) is not None
+
+
+def _snapshot_download_with_progress(
+    target_dir: Path, progress_cb: Optional[ProgressCallback]
+) -> None:
+    """Fallback when the file list is unavailable: let snapshot_download fan out."""
+    # Imported here so status checks (ace_models_present) don't load huggingface_hub
+    from huggingface_hub import snapshot_download
+
+    tqdm_class = None
+    if progress_cb is not None:
+        tqdm_class = _build_tqdm_with_progress_cb(progress_cb)
+
+    kwargs = {
+        "repo_id": ACE_REPO_ID,
+        "local_dir": str(target_dir),
+        # local_dir_use_symlinks deprecated; new behavior copies into local_dir
+        "max_workers": DOWNLOAD_MAX_WORKERS,
+        "etag_timeout": DOWNLOAD_ETAG_TIMEOUT,
+    }
+    if tqdm_class is not None:
+        kwargs["tqdm_class"] = tqdm_class
+
+    try:
+        snapshot_download(**kwargs)
+    except TypeError as t_err:
+        # Older huggingface_hub may not support tqdm_class.
+        # Fall back to a plain download; progress just won't be mirrored.
+        print(
+            "[CDMF] WARNING: snapshot_download() does not support tqdm_class; "
+            "download progress will not be reflected precisely:", t_err
+        )
+        snapshot_download(
+            repo_id=ACE_REPO_ID,
+            local_dir=str(target_dir),
+            max_workers=DOWNLOAD_MAX_WORKERS,
+        )
 
 
 def ensure_ace_models(progress_cb: Optional[Callable[[float], None]] = None) -> Path:
@@ -100,13 +393,13 @@ def ensure_ace_models(progress_cb: Optional[Callable[[float], None]] = None) ->
       <models_folder>/checkpoints/models--ACE-Step--ACE-Step-v1-3.5B
 
     If `progress_cb` is provided, it will be called with a float in [0, 1]
-    reflecting approximate snapshot_download progress.
+    reflecting approximate download progress.
     """
     checkpoint_root = get_ace_checkpoint_root()
     target_dir = checkpoint_root / ACE_LOCAL_DIRNAME
 
     # If it's already there and non-empty, we're done.
-    if target_dir.is_dir() and any(target_dir.iterdir()):
+    if _dir_has_entries(target_dir):
         if progress_cb is not None:
             try:
                 progress_cb(1.0)
@@ -122,41 +415,43 @@ def ensure_ace_models(progress_cb: Optional[Callable[[float], None]] = None) ->
     # Ensure parent exists
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    # Build a tqdm_class for real progress if requested
-    if progress_cb is not None:
-        tqdm_class = _build_tqdm_with_progress_cb(progress_cb)
-    else:
-        tqdm_class = None
+    use_hf_transfer = _enable_hf_transfer()
+    if use_hf_transfer:
+        print("[CDMF] hf_transfer enabled (set HF_HUB_ENABLE_HF_TRANSFER=0 to disable).")
 
     try:
-        kwargs = {
-            "repo_id": ACE_REPO_ID,
-            "local_dir": str(target_dir),
-            # local_dir_use_symlinks deprecated; new behavior copies into local_dir
-        }
-        if tqdm_class is not None:
-            kwargs["tqdm_class"] = tqdm_class
-
-        downloaded_path = Path(snapshot_download(**kwargs))
-    except TypeError as t_err:
-        # Older huggingface_hub may not support tqdm_class.
-        # Fall back to a plain download; progress just won't be mirrored.
-        print(
-            "[CDMF] WARNING: snapshot_download() does not support tqdm_class; "
-            "download progress will not be reflected precisely:", t_err
-        )
-        downloaded_path = Path(
-            snapshot_download(
-                repo_id=ACE_REPO_ID,
-                local_dir=str(target_dir),
-            )
-        )
+        files = _list_repo_files()
+    except Exception as exc:
+        print("[CDMF] WARNING: Could not list repo files; using snapshot_download:", exc)
+        files = []
+
+    stop_poller = None
+    try:
+        if files:
+            expected_bytes = sum(size for _name, size in files)
+            if progress_cb is not None and expected_bytes > 0:
+                stop_poller = _start_dir_size_progress(target_dir, expected_bytes, progress_cb)
+            _download_files_parallel(files, target_dir)
+        else:
+            _snapshot_download_with_progress(target_dir, progress_cb)
     except Exception as exc:
         print("[CDMF] ERROR: Failed to download ACE-Step model:", exc)
         print("       If you already downloaded it manually,")
         print("       place the model contents here:")
         print(f"       {target_dir}")
         raise
+    finally:
+        if stop_poller is not None:
+            stop_poller.set()
+
+    if progress_cb is not None:
+        try:
+            progress_cb(1.0)
+        except Exception:
+            pass
+
+    print("[CDMF] ACE-Step model downloaded to:", target_dir)
+    return target_dir
 
 
 if __name__ == "__main__":
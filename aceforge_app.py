@@ -9,9 +9,13 @@ from __future__ import annotations
 import sys
 import os
 import threading
-import time
 import socket
 import atexit
+import gc
+import logging
+import traceback
+import importlib.abc
+import importlib.util
 from pathlib import Path
 
 # CRITICAL: Prevent module from being executed multiple times
@@ -25,13 +29,19 @@ if hasattr(sys.modules.get(__name__, None), '_aceforge_app_executed'):
 # Mark module as executed
 sys.modules[__name__]._aceforge_app_executed = True
 
-# Try to import fcntl (Unix/macOS only)
+logger = logging.getLogger(__name__)
+
+# Try to import fcntl (Unix/macOS only); msvcrt provides the Windows equivalent
 try:
     import fcntl
     _FCNTL_AVAILABLE = True
 except ImportError:
     _FCNTL_AVAILABLE = False
-    print("[AceForge] WARNING: fcntl not available - single-instance lock disabled", flush=True)
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+        print("[AceForge] WARNING: fcntl not available - single-instance lock disabled", flush=True)
 
 # Set environment variables early
 os.environ.setdefault("HF_HUB_DISABLE_SYMLINKS", "1")
@@ -47,17 +57,19 @@ os.environ.setdefault("PYTORCH_JIT", "0")  # Alternative env var
 os.environ.setdefault("COQUI_TOS_AGREED", "1")
 
 # CRITICAL for Voice Cloning in frozen apps: .py source isn't in the bundle, so
-# inspect.findsource (and thus getsourcelines/getsourcefile/getsource) can raise
+# inspect.findsource (and thus getsourcelines/getsource) can raise
 # OSError('could not get source code') when linecache.getlines returns [].
-# Patch findsource (the lowest-level raiser) and the common entry points.
+# Patch only findsource: getsourcelines/getsource resolve it through the inspect
+# module globals, so one wrapper covers them without adding a frame per entry
+# point. (Padding linecache instead isn't enough - findsource still raises for
+# functions whose co_firstlineno is past the placeholder, and for classes.)
 if getattr(sys, "frozen", False) or hasattr(sys, "_MEIPASS"):
     import inspect
     _orig_findsource = inspect.findsource
-    _orig_gl = inspect.getsourcelines
-    _orig_gf = inspect.getsourcefile
-    _orig_src = getattr(inspect, "getsource", None)
 
-    _FROZEN_DUMMY = (["def _frozen_placeholder(*a, **k):\n", "    pass\n"], 1)
+    # 0-based line number, so getsourcelines() reports line 1 and getblock()
+    # returns the whole placeholder def
+    _FROZEN_DUMMY = (["def _frozen_placeholder(*a, **k):\n", "    pass\n"], 0)
 
     def _patched_findsource(obj):
         try:
@@ -65,45 +77,19 @@ if getattr(sys, "frozen", False) or hasattr(sys, "_MEIPASS"):
         except OSError:
             return _FROZEN_DUMMY
 
-    def _patched_getsourcelines(obj):
-        try:
-            return _orig_gl(obj)
-        except OSError:
-            return _FROZEN_DUMMY
-
-    def _patched_getsourcefile(obj):
-        try:
-            return _orig_gf(obj)
-        except OSError:
-            return "<frozen>"
-
-    def _patched_getsource(obj):
-        try:
-            if _orig_src:
-                return _orig_src(obj)
-            lines, _ = _orig_gl(obj)
-            return "".join(lines)
-        except OSError:
-            return "def _frozen_placeholder(*a, **k):\n    pass\n"
-
     inspect.findsource = _patched_findsource
-    inspect.getsourcelines = _patched_getsourcelines
-    inspect.getsourcefile = _patched_getsourcefile
-    if _orig_src:
-        inspect.getsource = _patched_getsource
-    print("[AceForge] Patched inspect for frozen app (findsource, getsourcelines, getsourcefile, getsource).", flush=True)
+    print("[AceForge] Patched inspect.findsource for frozen app.", flush=True)
 
 # Critical: Import lzma EARLY (before any ACE-Step imports)
-try:
-    import lzma
-    import _lzma
-    test_data = b"test"
-    compressed = lzma.compress(test_data)
-    decompressed = lzma.decompress(compressed)
-    if decompressed == test_data and getattr(sys, 'frozen', False):
+# Only the frozen bundle can ship a broken _lzma, and importing the C extension
+# is enough to catch that; a normal interpreter skips the check.
+if getattr(sys, 'frozen', False):
+    try:
+        import lzma
+        import _lzma
         print("[AceForge] lzma module initialized successfully.", flush=True)
-except Exception as e:
-    print(f"[AceForge] WARNING: lzma initialization: {e}", flush=True)
+    except Exception as e:
+        print(f"[AceForge] WARNING: lzma initialization: {e}", flush=True)
 
 # When frozen and launched with --train, run the LoRA trainer in this process and exit (no GUI).
 # This allows Training to work from the app bundle; the parent app spawns us with --train + args.
@@ -118,73 +104,162 @@ if getattr(sys, "frozen", False) and "--train" in sys.argv:
     run_from_argv()
     sys.exit(0)
 
-# Import pywebview FIRST and patch it BEFORE importing music_forge_ui
-# This ensures that even if music_forge_ui tries to use webview, it will be protected
-import webview
+class _PostExecLoader(importlib.abc.Loader):
+    """Delegating loader that runs a hook once, right after the real module body has executed"""
+    def __init__(self, loader, on_exec):
+        self._loader = loader
+        self._on_exec = on_exec
+
+    def __getattr__(self, name):
+        # get_resource_reader, is_package, get_code, ... come from the real loader
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        # LazyLoader left this wrapper as the module's loader; hand the real one
+        # back so importlib.resources and friends see the usual loader type
+        module.__spec__.loader = self._loader
+        module.__loader__ = self._loader
+        self._on_exec(module)
+
+def _lazy_import(name, on_load=None):
+    """
+    Return module `name`, deferring execution of its body until first attribute access.
+    `on_load(module)` runs exactly once, after the real load, whoever triggers it.
+    """
+    if name in sys.modules:
+        module = sys.modules[name]
+        if on_load is not None:
+            on_load(module)
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}")
+    loader = spec.loader if on_load is None else _PostExecLoader(spec.loader, on_load)
+    loader = importlib.util.LazyLoader(loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
 
 # CRITICAL: Singleton guards for webview operations
-# These ensure webview.create_window() and webview.start() can ONLY be called once
-# This must happen BEFORE importing music_forge_ui to protect against any webview usage there
-_original_webview_start = webview.start
-_original_webview_create_window = webview.create_window
+# These ensure webview.create_window() and webview.start() can ONLY be called once.
+# Installed by _install_webview_singletons() the moment pywebview is actually loaded,
+# so no caller can ever see the unwrapped functions
+_original_webview_start = None
+_original_webview_create_window = None
 _webview_start_called = False
 _webview_window_created = False
-_webview_lock = threading.Lock()
+
+# Both wrappers run on the main thread (pywebview requires start() there and
+# main() creates the window before starting), so a plain flag is enough - no
+# lock. A lock held across start() would also stay held until the GUI exits.
 
 def _singleton_webview_start(*args, **kwargs):
     """Singleton wrapper for webview.start() - prevents duplicate event loops"""
     global _webview_start_called
+    if threading.current_thread() is not threading.main_thread():
+        raise RuntimeError("webview.start() must be called on the main thread")
     
-    with _webview_lock:
-        if _webview_start_called:
-            # webview.start() already called - silently block
-            return None
-        
-        _webview_start_called = True
-        return _original_webview_start(*args, **kwargs)
+    if _webview_start_called:
+        # webview.start() already called - block the duplicate event loop
+        logger.warning("Blocked duplicate webview.start() call")
+        return None
+    
+    _webview_start_called = True
+    return _original_webview_start(*args, **kwargs)
 
 def _singleton_webview_create_window(*args, **kwargs):
     """Singleton wrapper for webview.create_window() - prevents duplicate windows"""
     global _webview_window_created
     
-    with _webview_lock:
-        if _webview_window_created:
-            # Window already created - return existing window or None
-            if webview.windows:
-                return webview.windows[0]
-            return None
-        
-        _webview_window_created = True
-        return _original_webview_create_window(*args, **kwargs)
+    if _webview_window_created:
+        # Window already created - return existing window or None
+        logger.warning("Blocked duplicate webview.create_window() call")
+        if webview.windows:
+            return webview.windows[0]
+        return None
+    
+    _webview_window_created = True
+    return _original_webview_create_window(*args, **kwargs)
 
-# Replace webview functions with singleton wrappers IMMEDIATELY
-# This protects against any code that imports webview after this point
-webview.start = _singleton_webview_start
-webview.create_window = _singleton_webview_create_window
+def _install_webview_singletons(module):
+    """Replace webview functions with the singleton wrappers (runs once, on first real load)"""
+    global _original_webview_start, _original_webview_create_window
+    if _original_webview_start is not None:
+        return
+    _original_webview_start = module.start
+    _original_webview_create_window = module.create_window
+    module.start = _singleton_webview_start
+    module.create_window = _singleton_webview_create_window
 
-# NOW import Flask app from music_forge_ui
-# If music_forge_ui tries to use webview, it will get the patched (protected) version
-from music_forge_ui import app
+# pywebview pulls in pyobjc/WebKit bindings; bind the name now but only pay for
+# the import (and patch it) when a window is actually needed
+webview = _lazy_import("webview", on_load=_install_webview_singletons)
 
 # Server configuration
 SERVER_HOST = "127.0.0.1"
 SERVER_PORT = 5056
 SERVER_URL = f"http://{SERVER_HOST}:{SERVER_PORT}"
+# Worker threads scale with cores: progress/status polling, log streaming and
+# static assets all hit the server concurrently while a generation is running
+SERVER_THREADS = max(8, (os.cpu_count() or 4) * 2)
+
+# Fixed main-window options; main() only adds the per-instance js_api
+WINDOW_OPTIONS = dict(
+    title="AceForge",
+    url=SERVER_URL,
+    width=1400,
+    height=900,
+    min_size=(1000, 700),
+    resizable=True,
+    fullscreen=False,
+    on_top=False,
+    shadow=True,
+)
+
+# Web Inspector stays off in shipped builds; set ACEFORGE_DEBUG=1 to enable it
+WEBVIEW_DEBUG = os.environ.get("ACEFORGE_DEBUG", "").strip() not in ("", "0")
 
 # Application state - managed by singleton guards above
 _app_initialized = False
+# Makes main()'s check-and-set of _app_initialized atomic
+_init_lock = threading.Lock()
 
 # Single-instance lock file to prevent multiple app instances
 _LOCK_FILE = None
 _LOCK_FD = None
 
+def _try_lock_fd(fd):
+    """Take a non-blocking exclusive lock on fd; raises BlockingIOError/OSError if held elsewhere"""
+    if _FCNTL_AVAILABLE:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+def _release_instance_lock():
+    """Release the instance lock. The kernel also drops it if the process dies."""
+    global _LOCK_FD
+    if _LOCK_FD is None:
+        return
+    try:
+        if _FCNTL_AVAILABLE:
+            fcntl.flock(_LOCK_FD, fcntl.LOCK_UN)
+        os.close(_LOCK_FD)
+    except Exception:
+        pass
+    _LOCK_FD = None
+
 def acquire_instance_lock():
-    """Acquire a file-based lock to ensure only one instance runs"""
+    """Acquire an OS-level lock on a file to ensure only one instance runs"""
     global _LOCK_FILE, _LOCK_FD
     
-    if not _FCNTL_AVAILABLE:
-        # fcntl not available - skip locking (shouldn't happen on macOS)
-        print("[AceForge] WARNING: fcntl not available, skipping instance lock", flush=True)
+    if not _FCNTL_AVAILABLE and msvcrt is None:
+        print("[AceForge] WARNING: no file locking available, skipping instance lock", flush=True)
         return True
     
     # Use a lock file in the user's Application Support directory
@@ -192,82 +267,66 @@ def acquire_instance_lock():
     lock_dir.mkdir(parents=True, exist_ok=True)
     _LOCK_FILE = lock_dir / 'aceforge.lock'
     
+    fd = None
     try:
-        # Try to open the lock file in exclusive mode
-        _LOCK_FD = os.open(str(_LOCK_FILE), os.O_CREAT | os.O_WRONLY | os.O_TRUNC)
+        # No O_TRUNC here: truncating before we hold the lock would wipe the running instance's PID
+        fd = os.open(str(_LOCK_FILE), os.O_CREAT | os.O_RDWR, 0o644)
         
-        # Try to acquire an exclusive lock (non-blocking)
         try:
-            fcntl.flock(_LOCK_FD, fcntl.LOCK_EX | fcntl.LOCK_NB)
-            # Lock acquired successfully - write our PID
-            os.write(_LOCK_FD, str(os.getpid()).encode())
-            os.fsync(_LOCK_FD)
-            
-            # Register cleanup function
-            def release_lock():
-                global _LOCK_FD, _LOCK_FILE
-                if _LOCK_FD is not None:
-                    try:
-                        if _FCNTL_AVAILABLE:
-                            fcntl.flock(_LOCK_FD, fcntl.LOCK_UN)
-                        os.close(_LOCK_FD)
-                        if _LOCK_FILE and _LOCK_FILE.exists():
-                            _LOCK_FILE.unlink()
-                    except Exception:
-                        pass
-                    _LOCK_FD = None
-            
-            atexit.register(release_lock)
-            print("[AceForge] Instance lock acquired - single instance enforced", flush=True)
-            return True
-            
-        except BlockingIOError:
-            # Lock is held by another process
-            os.close(_LOCK_FD)
-            _LOCK_FD = None
-            
-            # Try to read the PID from the lock file
+            _try_lock_fd(fd)
+        except OSError:
+            # Lock is held by a live process (a crashed one would have released it)
             try:
-                if _LOCK_FILE.exists():
-                    with open(_LOCK_FILE, 'r') as f:
-                        pid = int(f.read().strip())
-                    # Check if the process is still running
-                    try:
-                        os.kill(pid, 0)  # Signal 0 just checks if process exists
-                        print(f"[AceForge] ERROR: Another instance is already running (PID {pid})", flush=True)
-                        print("[AceForge] Please close the existing instance before starting a new one.", flush=True)
-                    except ProcessLookupError:
-                        # Process doesn't exist - stale lock file
-                        print("[AceForge] WARNING: Stale lock file detected, removing...", flush=True)
-                        _LOCK_FILE.unlink()
-                        # Retry once
-                        return acquire_instance_lock()
+                os.lseek(fd, 0, os.SEEK_SET)
+                pid = os.read(fd, 32).decode(errors="replace").strip()
             except Exception:
-                pass
+                pid = ""
+            os.close(fd)
             
+            if pid:
+                print(f"[AceForge] ERROR: Another instance is already running (PID {pid})", flush=True)
+                print("[AceForge] Please close the existing instance before starting a new one.", flush=True)
             print("[AceForge] ERROR: Another instance of AceForge is already running.", flush=True)
             print("[AceForge] Only one instance can run at a time.", flush=True)
             return False
+        
+        # Lock acquired - record our PID for the error message above.
+        # The file is never unlinked: removing it while another process has it open
+        # would let two instances lock two different inodes.
+        os.ftruncate(fd, 0)
+        os.lseek(fd, 0, os.SEEK_SET)
+        os.write(fd, str(os.getpid()).encode())
+        
+        # Only publish the fd once it holds the lock, so a failed attempt
+        # can never drop the handle of a lock this process already owns
+        _LOCK_FD = fd
+        atexit.register(_release_instance_lock)
+        print("[AceForge] Instance lock acquired - single instance enforced", flush=True)
+        return True
             
     except Exception as e:
         print(f"[AceForge] WARNING: Could not acquire instance lock: {e}", flush=True)
         print("[AceForge] Continuing anyway, but multiple instances may cause issues.", flush=True)
-        if _LOCK_FD is not None:
+        if fd is not None and fd != _LOCK_FD:
             try:
-                os.close(_LOCK_FD)
+                os.close(fd)
             except Exception:
                 pass
-            _LOCK_FD = None
         return True  # Allow to continue, but warn
 
 class WindowControlAPI:
     """API for window control operations (minimize, restore, etc.)"""
     
+    def __init__(self, window=None):
+        # The app's single window, set by main() once it exists. Underscored so
+        # pywebview doesn't expose it to JavaScript.
+        self._window = window
+    
     def minimize(self):
         """Minimize the window"""
         try:
-            if webview.windows:
-                webview.windows[0].minimize()
+            if self._window is not None:
+                self._window.minimize()
                 return {"status": "ok"}
             return {"status": "error", "message": "No window available"}
         except Exception as e:
@@ -276,8 +335,8 @@ class WindowControlAPI:
     def restore(self):
         """Restore the window if minimized or maximized"""
         try:
-            if webview.windows:
-                webview.windows[0].restore()
+            if self._window is not None:
+                self._window.restore()
                 return {"status": "ok"}
             return {"status": "error", "message": "No window available"}
         except Exception as e:
@@ -286,88 +345,134 @@ class WindowControlAPI:
     def maximize(self):
         """Maximize the window"""
         try:
-            if webview.windows:
-                webview.windows[0].maximize()
+            if self._window is not None:
+                self._window.maximize()
                 return {"status": "ok"}
             return {"status": "error", "message": "No window available"}
         except Exception as e:
             return {"status": "error", "message": str(e)}
 
-def wait_for_server(max_wait=30):
-    """Wait for Flask server to be ready"""
-    waited = 0
-    while waited < max_wait:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(1)
-            result = sock.connect_ex((SERVER_HOST, SERVER_PORT))
-            sock.close()
-            if result == 0:
-                return True
-        except Exception:
-            pass
-        time.sleep(0.5)
-        waited += 0.5
-    return False
-
-def cleanup_resources():
-    """Clean up all resources and release memory before shutdown"""
+# Set once cleanup_resources() has run; the close handler, the post-start path
+# and atexit can all reach it
+_cleanup_done = False
+
+def cleanup_resources(final_exit=False):
+    """
+    Clean up all resources and release memory before shutdown.
+
+    Cached GPU blocks are not handed back to the driver here: that is a
+    synchronizing, potentially slow call that buys nothing when the process is
+    about to exit (the driver reclaims everything). With final_exit=True the
+    caller is about to os._exit(), which runs no finalizers, so the full
+    garbage collection is skipped as well.
+    """
+    global _cleanup_done
+    if _cleanup_done:
+        return
+    _cleanup_done = True
+    
     print("[AceForge] Cleaning up resources and releasing memory...", flush=True)
     
+    # Track metadata saves are coalesced; write a pending one before os._exit()
     try:
-        # Clean up ACE-Step pipeline if it exists
+        cdmf_tracks = sys.modules.get("cdmf_tracks")
+        if cdmf_tracks is not None:
+            cdmf_tracks.flush_track_meta()
+    except Exception as e:
+        print(f"[AceForge] Warning: Error saving track metadata: {e}", flush=True)
+    
+    try:
+        # Clean up ACE-Step pipeline if it exists (never import it just to find out)
         try:
-            import generate_ace
+            generate_ace = sys.modules.get("generate_ace")
             # Access the module-level globals
             if hasattr(generate_ace, '_ACE_PIPELINE') and hasattr(generate_ace, '_ACE_PIPELINE_LOCK'):
                 with generate_ace._ACE_PIPELINE_LOCK:
                     if generate_ace._ACE_PIPELINE is not None:
                         print("[AceForge] Cleaning up ACE-Step pipeline...", flush=True)
-                        try:
-                            # Call cleanup_memory to release GPU/CPU memory
-                            generate_ace._ACE_PIPELINE.cleanup_memory()
-                        except Exception as e:
-                            print(f"[AceForge] Warning: Error during pipeline cleanup: {e}", flush=True)
-                        
                         # Clear the global pipeline reference
                         generate_ace._ACE_PIPELINE = None
                         print("[AceForge] ACE-Step pipeline released", flush=True)
-        except ImportError:
-            pass  # generate_ace not available
         except Exception as e:
             print(f"[AceForge] Warning: Error accessing pipeline: {e}", flush=True)
         
-        # Clear PyTorch caches
-        try:
-            import torch
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                print("[AceForge] CUDA cache cleared", flush=True)
-            elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
-                try:
-                    torch.mps.empty_cache()
-                    print("[AceForge] MPS cache cleared", flush=True)
-                except Exception:
-                    pass
-        except Exception as e:
-            print(f"[AceForge] Warning: Error clearing PyTorch cache: {e}", flush=True)
-        
-        # Force garbage collection
-        import gc
-        gc.collect()
-        print("[AceForge] Garbage collection completed", flush=True)
+        # Force a full garbage collection, including objects frozen at startup
+        if not final_exit:
+            gc.unfreeze()
+            gc.collect(generation=2)
+            print("[AceForge] Garbage collection completed", flush=True)
         
     except Exception as e:
         print(f"[AceForge] Warning: Error during cleanup: {e}", flush=True)
     
     print("[AceForge] Resource cleanup completed", flush=True)
 
+# Set by start_flask_server once the socket is bound and the Flask app imported; main() waits on it
+_server_ready = threading.Event()
+
+def _bind_server_socket():
+    """Create the listening socket up front so readiness is known the moment bind() returns"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((SERVER_HOST, SERVER_PORT))
+    sock.listen(128)
+    return sock
+
+def _warm_up_device():
+    """
+    Initialise the torch device the pipeline will use (CUDA/Metal context) while the window is
+    still loading. Deliberately cheap: model weights are only prefetched on the generation path.
+    """
+    try:
+        import torch
+        if torch.cuda.is_available():
+            device = "cuda"
+        elif torch.backends.mps.is_available():
+            device = "mps"
+        else:
+            return
+        torch.zeros(1, device=device)
+    except Exception as e:
+        print(f"[AceForge] Device warm-up skipped: {e}", flush=True)
+
 def start_flask_server():
     """Start Flask server in background thread"""
-    from waitress import serve
     print(f"[AceForge] Starting Flask server on {SERVER_URL}...", flush=True)
     try:
-        serve(app, host=SERVER_HOST, port=SERVER_PORT, threads=4, channel_timeout=120)
+        sock = _bind_server_socket()
+    except OSError as e:
+        print(f"[AceForge] Flask server error: could not bind {SERVER_URL}: {e}", flush=True)
+        raise
+    try:
+        # Heavy: pulls in Flask, torch and ACE-Step. Done here, off the main
+        # thread, so a duplicate launch or guarded re-entry never pays for it.
+        from music_forge_ui import app
+        from waitress import serve
+    except Exception as e:
+        print(f"[AceForge] Flask server error: could not load app: {e}", flush=True)
+        sock.close()
+        raise
+    # Only now can the window be opened: the app is loaded, and connections
+    # queue in the kernel backlog for the moment until waitress starts accepting
+    _server_ready.set()
+    # Everything imported so far (Flask app, torch, ACE-Step modules) lives for the
+    # whole session; move it to the permanent generation so periodic collections
+    # during requests/generation don't keep re-traversing it
+    gc.freeze()
+    # Overlap GPU/Metal context creation with WebKit start-up
+    threading.Thread(target=_warm_up_device, daemon=True, name="DeviceWarmup").start()
+    try:
+        serve(
+            app,
+            sockets=[sock],
+            threads=SERVER_THREADS,
+            connection_limit=256,
+            channel_timeout=120,
+            cleanup_interval=30,
+            asyncore_use_poll=True,
+            ident=None,  # no Server header
+            _quiet=True,  # we print our own "Starting Flask server" line
+        )
     except Exception as e:
         print(f"[AceForge] Flask server error: {e}", flush=True)
         raise
@@ -384,25 +489,37 @@ def main():
         print("[AceForge] Exiting - another instance is running", flush=True)
         sys.exit(1)
     
-    # CRITICAL GUARD: Prevent multiple initialization or initialization during shutdown
-    if _app_initialized or _shutting_down:
-        return
-    
-    # Additional check: if webview is already running, don't initialize again
-    if _webview_start_called or len(webview.windows) > 0:
-        return
+    # CRITICAL GUARD: Prevent multiple initialization or initialization during shutdown.
+    # Check and claim under one lock so two callers can't both get past it.
+    with _init_lock:
+        if _app_initialized or _shutting_down:
+            print("[AceForge] Blocked main() re-entry (already initialized or shutting down)", flush=True)
+            return
+        
+        # Additional check: if webview is already running, don't initialize again
+        if _webview_start_called or len(webview.windows) > 0:
+            print("[AceForge] Blocked main() re-entry (webview already running)", flush=True)
+            return
+        
+        _app_initialized = True
     
-    _app_initialized = True
+    # Finish the lazy pywebview import here, on the main thread, before any other
+    # thread exists: LazyLoader is not thread-safe before Python 3.12, and the
+    # server thread or pywebview callbacks must never be the ones to trigger it
+    webview.windows
     
-    # Start Flask server in background thread
+    # Start Flask server in background thread (it also imports the Flask app,
+    # which a duplicate launch or guarded re-entry above never pays for)
     server_thread = threading.Thread(target=start_flask_server, daemon=True, name="FlaskServer")
     server_thread.start()
     
-    # Wait for server to be ready
+    # Wait for server to be ready. The app import has no fixed deadline (a cold
+    # torch import can be slow); if the server thread dies first, bail out.
     print("[AceForge] Waiting for server to start...", flush=True)
-    if not wait_for_server():
-        print("[AceForge] ERROR: Server failed to start in time", flush=True)
-        sys.exit(1)
+    while not _server_ready.wait(timeout=0.5):
+        if not server_thread.is_alive():
+            print("[AceForge] ERROR: Server failed to start", flush=True)
+            sys.exit(1)
     
     print(f"[AceForge] Server ready at {SERVER_URL}", flush=True)
     
@@ -412,7 +529,7 @@ def main():
     # Define window close handler for clean shutdown
     def on_window_closed():
         """Handle window close event - cleanup and exit"""
-        global _app_initialized, _shutting_down, _LOCK_FD, _LOCK_FILE
+        global _app_initialized, _shutting_down
         
         # Prevent any re-initialization or duplicate shutdown calls
         if _shutting_down:
@@ -420,19 +537,11 @@ def main():
         _shutting_down = True
         _app_initialized = False
         
-        # Clean up all resources and release memory
-        cleanup_resources()
+        # Clean up all resources (os._exit below hands the memory back to the OS)
+        cleanup_resources(final_exit=True)
         
         # Release instance lock
-        if _LOCK_FD is not None:
-            try:
-                if _FCNTL_AVAILABLE:
-                    fcntl.flock(_LOCK_FD, fcntl.LOCK_UN)
-                os.close(_LOCK_FD)
-                if _LOCK_FILE and _LOCK_FILE.exists():
-                    _LOCK_FILE.unlink()
-            except Exception:
-                pass
+        _release_instance_lock()
         
         # Exit immediately - no delays that could trigger re-initialization
         # Use os._exit to bypass any cleanup handlers that might trigger re-init
@@ -441,15 +550,7 @@ def main():
     # Create pywebview window pointing to Flask server
     # The singleton wrapper ensures this can only be called once
     window = webview.create_window(
-        title="AceForge",
-        url=SERVER_URL,
-        width=1400,
-        height=900,
-        min_size=(1000, 700),
-        resizable=True,
-        fullscreen=False,
-        on_top=False,
-        shadow=True,
+        **WINDOW_OPTIONS,
         js_api=window_api,  # Expose window control API to JavaScript
     )
     
@@ -457,18 +558,15 @@ def main():
         # Window creation was blocked (already exists) - should not happen, but handle gracefully
         print("[AceForge] ERROR: Window creation blocked but no window exists", flush=True)
         sys.exit(1)
+    window_api._window = window
     
     # Register window close event handler
     try:
         window.events.closed += on_window_closed
     except Exception as e:
         print(f"[AceForge] Warning: Could not register close handler: {e}", flush=True)
-        # Fallback: use atexit as backup
-        import atexit
-        atexit.register(cleanup_resources)
     
-    # Register atexit handler as backup cleanup
-    import atexit
+    # Register atexit handler as backup cleanup (a no-op if cleanup already ran)
     atexit.register(cleanup_resources)
     
     # Apply zoom from preferences (default 80%); takes effect on next launch if changed in Settings
@@ -482,20 +580,25 @@ def main():
     _WEBVIEW_ZOOM = f"{_z}%"
     _WEBVIEW_ZOOM_JS = f'document.documentElement.style.zoom = "{_WEBVIEW_ZOOM}";'
     
-    def _apply_webview_zoom(win):
-        time.sleep(1.8)  # allow initial page load
+    def _apply_webview_zoom():
         try:
-            if hasattr(win, 'run_js'):
-                win.run_js(_WEBVIEW_ZOOM_JS)
+            if hasattr(window, 'run_js'):
+                window.run_js(_WEBVIEW_ZOOM_JS)
             else:
-                win.evaluate_js(_WEBVIEW_ZOOM_JS)
+                window.evaluate_js(_WEBVIEW_ZOOM_JS)
             print(f"[AceForge] Webview zoom set to {_WEBVIEW_ZOOM}", flush=True)
         except Exception as e:
             print(f"[AceForge] Could not set webview zoom: {e}", flush=True)
     
+    # Apply zoom as soon as the page has loaded (and again after any reload)
+    # instead of guessing a delay
+    try:
+        window.events.loaded += _apply_webview_zoom
+    except Exception as e:
+        print(f"[AceForge] Warning: Could not register loaded handler, zoom not applied: {e}", flush=True)
+    
     # Start the GUI event loop (only once - this is a blocking call)
-    # Pass _apply_webview_zoom so it runs in a separate thread after window is ready
-    webview.start(_apply_webview_zoom, window, debug=False)
+    webview.start(debug=WEBVIEW_DEBUG)
     
     # This should not be reached (on_window_closed exits), but just in case
     cleanup_resources()
@@ -506,7 +609,6 @@ if __name__ == '__main__':
     try:
         main()
     except Exception as e:
-        import traceback
         error_msg = (
             "[AceForge] FATAL ERROR during startup:\n"
             f"{traceback.format_exc()}\n"
@@ -519,8 +621,9 @@ if __name__ == '__main__':
         try:
             log_dir = Path.home() / 'Library' / 'Logs' / 'AceForge'
             log_dir.mkdir(parents=True, exist_ok=True)
-            with open(log_dir / 'error.log', 'w') as f:
-                f.write(error_msg)
+            # Unbuffered so the traceback reaches disk before sys.exit tears things down
+            with open(log_dir / 'error.log', 'wb', buffering=0) as f:
+                f.write(error_msg.encode('utf-8', 'replace'))
         except:
             pass
         
@@ -10,8 +10,10 @@ import argparse
 import os
 import socket
 import sys
+import time
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+from urllib.parse import urlparse
 
 try:
     from loguru import logger
@@ -29,15 +31,43 @@ class DownloadCancelled(Exception):
 # Network & Download
 # =============================================================================
 
-def _can_access_google(timeout: float = 3.0) -> bool:
-    try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        sock.connect(("www.google.com", 443))
-        sock.close()
-        return True
-    except (socket.timeout, socket.error, OSError):
+# Reachability rarely changes within a session; reuse a probe result for a minute
+# instead of paying a TCP connect (up to `timeout` seconds) per model download.
+_PROBE_TTL = 60.0
+_hf_probe: Dict[str, object] = {"t": 0.0, "v": None, "target": None}
+
+def _hf_reachable(timeout: float = 1.5) -> bool:
+    """
+    True if the HuggingFace endpoint accepts a TCP connection (decides whether to
+    try HF or ModelScope first). Probes HF_ENDPOINT's host and port when a mirror
+    is configured; HF_HUB_OFFLINE skips the probe.
+    """
+    if os.environ.get("HF_HUB_OFFLINE", "").strip().lower() in ("1", "true", "yes", "on"):
         return False
+    endpoint = urlparse(os.environ.get("HF_ENDPOINT") or "https://huggingface.co")
+    try:
+        port = endpoint.port
+    except ValueError:
+        port = None
+    if port is None:
+        port = 80 if endpoint.scheme == "http" else 443
+    target = (endpoint.hostname or "huggingface.co", port)
+    now = time.monotonic()
+    if (
+        _hf_probe["v"] is not None
+        and _hf_probe["target"] == target
+        and now - _hf_probe["t"] < _PROBE_TTL
+    ):
+        return bool(_hf_probe["v"])
+    try:
+        socket.create_connection(target, timeout=timeout).close()
+        ok = True
+    except OSError:
+        ok = False
+    _hf_probe["t"] = time.monotonic()
+    _hf_probe["v"] = ok
+    _hf_probe["target"] = target
+    return ok
 
 def _make_progress_tqdm(
     progress_callback: Optional[Callable[..., None]],
@@ -113,7 +143,7 @@ def _smart_download(
     cancel_check: Optional[Callable[[], bool]] = None,
 ) -> Tuple[bool, str]:
     local_dir.mkdir(parents=True, exist_ok=True)
-    use_hf_first = prefer_source != "modelscope" if prefer_source else _can_access_google()
+    use_hf_first = prefer_source != "modelscope" if prefer_source else _hf_reachable()
     hf_kw = {"progress_callback": progress_callback, "cancel_check": cancel_check}
     if use_hf_first:
         try:
@@ -161,25 +191,37 @@ MAIN_MODEL_COMPONENTS = [
     "Qwen3-Embedding-0.6B",
     "acestep-5Hz-lm-1.7B",
 ]
+MAIN_MODEL_COMPONENTS_SET = frozenset(MAIN_MODEL_COMPONENTS)
 DEFAULT_LM_MODEL = "acestep-5Hz-lm-1.7B"
 
 def get_checkpoints_dir(custom_dir: Optional[str] = None) -> Path:
     if custom_dir:
-        return Path(custom_dir).resolve()
+        # abspath is lexical; resolve() would realpath every component
+        return Path(os.path.abspath(custom_dir))
     return Path.cwd() / "checkpoints"
 
 def check_main_model_exists(checkpoints_dir: Optional[Path] = None) -> bool:
     if checkpoints_dir is None:
         checkpoints_dir = get_checkpoints_dir()
-    for component in MAIN_MODEL_COMPONENTS:
-        if not (checkpoints_dir / component).exists():
-            return False
-    return True
+    # One directory listing instead of an exists() per component
+    try:
+        with os.scandir(checkpoints_dir) as it:
+            names = {entry.name for entry in it}
+    except OSError:
+        return False
+    return MAIN_MODEL_COMPONENTS_SET.issubset(names)
 
-def check_model_exists(model_name: str, checkpoints_dir: Optional[Path] = None) -> bool:
+def check_model_exists(
+    model_name: str,
+    checkpoints_dir: Optional[Path] = None,
+    _existing_names: Optional[FrozenSet[str]] = None,
+) -> bool:
+    # Callers checking many models pass one listing of checkpoints_dir instead of a stat each
+    if _existing_names is not None:
+        return model_name in _existing_names
     if checkpoints_dir is None:
         checkpoints_dir = get_checkpoints_dir()
-    return (checkpoints_dir / model_name).exists()
+    return os.path.exists(os.path.join(os.fspath(checkpoints_dir), model_name))
 
 def download_main_model(
     checkpoints_dir: Optional[Path] = None,
@@ -207,18 +249,20 @@ def download_submodel(
     prefer_source: Optional[str] = None,
     progress_callback: Optional[Callable[..., None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    _existing_names: Optional[FrozenSet[str]] = None,
 ) -> Tuple[bool, str]:
     if model_name not in SUBMODEL_REGISTRY:
         return False, f"Unknown model '{model_name}'. Available: {', '.join(SUBMODEL_REGISTRY.keys())}"
     if checkpoints_dir is None:
         checkpoints_dir = get_checkpoints_dir()
     checkpoints_dir.mkdir(parents=True, exist_ok=True)
-    model_path = checkpoints_dir / model_name
-    if not force and model_path.exists():
-        return True, f"Model '{model_name}' already exists at {model_path}"
+    model_path_str = os.path.join(os.fspath(checkpoints_dir), model_name)
+    if not force and check_model_exists(model_name, checkpoints_dir, _existing_names):
+        return True, f"Model '{model_name}' already exists at {model_path_str}"
     repo_id = SUBMODEL_REGISTRY[model_name]
+    # _smart_download creates the directory, so it gets a Path
     return _smart_download(
-        repo_id, model_path, token, prefer_source,
+        repo_id, Path(model_path_str), token, prefer_source,
         progress_callback=progress_callback, cancel_check=cancel_check,
     )
 
@@ -250,8 +294,11 @@ def main() -> int:
         print(msg)
         if not success:
             return 1
+        # List checkpoints_dir once (after the main download) for all sub-model checks
+        with os.scandir(checkpoints_dir) as it:
+            existing = frozenset(entry.name for entry in it)
         for name in SUBMODEL_REGISTRY:
-            ok, m = download_submodel(name, checkpoints_dir, args.force, args.token)
+            ok, m = download_submodel(name, checkpoints_dir, args.force, args.token, _existing_names=existing)
             print(m)
             if not ok:
                 success = False
@@ -25,10 +25,6 @@ def _track_meta() -> dict:
     return cdmf_tracks.load_track_meta()
 
 
-def _save_track_meta(meta: dict) -> None:
-    cdmf_tracks.save_track_meta(meta)
-
-
 def _music_dir() -> Path:
     return Path(get_output_dir())
 
@@ -288,17 +284,16 @@ def update_song(song_id: str):
     music_dir = _music_dir()
     if not (music_dir / filename).is_file():
         return jsonify({"error": "Song not found"}), 404
-    meta = _track_meta()
-    entry = meta.get(filename, {})
     data = request.get_json(silent=True) or {}
-    if "title" in data:
-        entry["title"] = str(data["title"])[: 500]
-    if "style" in data:
-        entry["style"] = str(data["style"])[: 500]
-    if "lyrics" in data:
-        entry["lyrics"] = str(data["lyrics"])[: 10000]
-    meta[filename] = entry
-    _save_track_meta(meta)
+    with cdmf_tracks.update_track_meta() as meta:
+        entry = meta.get(filename, {})
+        if "title" in data:
+            entry["title"] = str(data["title"])[: 500]
+        if "style" in data:
+            entry["style"] = str(data["style"])[: 500]
+        if "lyrics" in data:
+            entry["lyrics"] = str(data["lyrics"])[: 10000]
+        meta[filename] = entry
     song = _song_from_filename(filename, meta)
     return jsonify({"song": song})
 
@@ -349,9 +344,8 @@ def delete_song(song_id: str):
         path.unlink()
     except OSError as e:
         return jsonify({"error": str(e)}), 500
-    meta = _track_meta()
-    meta.pop(filename, None)
-    _save_track_meta(meta)
+    with cdmf_tracks.update_track_meta() as meta:
+        meta.pop(filename, None)
     return jsonify({"success": True})
 
 
@@ -359,12 +353,11 @@ def delete_song(song_id: str):
 def toggle_like(song_id: str):
     """POST /api/songs/:id/like — stub: toggle like in metadata."""
     filename = _id_to_filename(song_id)
-    meta = _track_meta()
-    entry = meta.get(filename, {})
-    liked = not entry.get("favorite", False)
-    entry["favorite"] = liked
-    meta[filename] = entry
-    _save_track_meta(meta)
+    with cdmf_tracks.update_track_meta() as meta:
+        entry = meta.get(filename, {})
+        liked = not entry.get("favorite", False)
+        entry["favorite"] = liked
+        meta[filename] = entry
     return jsonify({"liked": liked})
 
 
@@ -5,13 +5,15 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
+import hashlib
 import json
 import os
 import re
 import time
 import traceback
 
-from flask import Blueprint, request, render_template_string, jsonify
+from flask import Blueprint, current_app, make_response, render_template, request, jsonify
+from jinja2 import DictLoader
 from werkzeug.utils import secure_filename
 from pydub import AudioSegment
 
@@ -20,6 +22,7 @@ import cdmf_tracks
 from cdmf_paths import (
     APP_DIR,
     get_output_dir,
+    get_user_data_dir,
     TRAINING_DATA_ROOT,
     CUSTOM_LORA_ROOT,
     SEED_VIBES,
@@ -77,6 +80,31 @@ def _extract_first_json_object(text: str) -> Dict[str, Any]:
     snippet = cleaned[start:end]
     return json.loads(snippet)
 
+# Name the UI template is registered under (blueprint loader), so Jinja's
+# template cache and on-disk bytecode cache can key it (from_string()
+# templates are compiled again on every render)
+UI_TEMPLATE_NAME = "cdmf_ui.html"
+
+
+def _enable_bytecode_cache(state) -> None:
+    """
+    Keep compiled templates on disk (keyed by name and source checksum), so
+    later launches skip lexing and parsing the large UI template as well.
+    Leaves an app-configured bytecode cache alone.
+    """
+    from jinja2 import FileSystemBytecodeCache
+
+    jinja_env = state.app.jinja_env
+    if jinja_env.bytecode_cache is not None:
+        return
+    try:
+        cache_dir = get_user_data_dir() / "jinja_cache"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return
+    jinja_env.bytecode_cache = FileSystemBytecodeCache(str(cache_dir))
+
+
 def create_generation_blueprint(
     html_template: str,
     ui_defaults: Dict[str, Any],
@@ -89,6 +117,10 @@ def create_generation_blueprint(
       * "/generate" -> ACE-Step generation endpoint
     """
     bp = Blueprint("cdmf_generation", __name__)
+    # Serve the UI source as a named template through the app's Jinja
+    # environment: compiled once, then rendered with render_template()
+    bp.jinja_loader = DictLoader({UI_TEMPLATE_NAME: html_template})
+    bp.record_once(_enable_bytecode_cache)
 
     UI_DEFAULT_TARGET_SECONDS = int(ui_defaults.get("target_seconds", 90))
     UI_DEFAULT_FADE_IN = float(ui_defaults.get("fade_in", 0.5))
@@ -100,6 +132,10 @@ def create_generation_blueprint(
         ui_defaults.get("instrumental_gain_db", 0.0)
     )
 
+    # Last rendered index page as (digest of its template context, UTF-8 html);
+    # one slot so concurrent requests never pair a key with another's html
+    _index_cache: Dict[str, Any] = {"entry": None}
+
     def _index_view():
         cdmf_state.reset_progress()
 
@@ -112,8 +148,7 @@ def create_generation_blueprint(
             model_state = cdmf_state.MODEL_STATUS["state"]
             model_message = cdmf_state.MODEL_STATUS["message"]
 
-        return render_template_string(
-            html_template,
+        context = dict(
             version=APP_VERSION,
             # Let the frontend pick a random preset; start empty here.
             prompt="",
@@ -158,6 +193,26 @@ def create_generation_blueprint(
             lora_name_or_path="",
         )
 
+        # The page only changes with its inputs (tracks, presets, model
+        # state, output dir, ...): reuse the last render when they match,
+        # and let the browser revalidate with the same digest as ETag.
+        # Context processor output is part of those inputs, so run them for
+        # the digest too (render_template() runs them again on a miss).
+        inputs = dict(context)
+        current_app.update_template_context(inputs)
+        key = hashlib.blake2b(
+            json.dumps(inputs, sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        entry = _index_cache["entry"]
+        if entry is None or entry[0] != key:
+            entry = (key, render_template(UI_TEMPLATE_NAME, **context).encode("utf-8"))
+            _index_cache["entry"] = entry
+
+        response = make_response(entry[1])
+        response.set_etag(key)
+        return response.make_conditional(request)
+
     if serve_index:
         bp.add_url_rule("/", "index", _index_view, methods=["GET"])
 
@@ -465,7 +520,7 @@ def create_generation_blueprint(
                 src_audio_path = manual_path or None
 
             cdmf_state.reset_progress()
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["current"] = 0.0
                 cdmf_state.GENERATION_PROGRESS["total"] = 1.0
                 cdmf_state.GENERATION_PROGRESS["stage"] = "ace_infer"
@@ -519,89 +574,88 @@ def create_generation_blueprint(
 
             # Update per-track metadata
             try:
-                meta = cdmf_tracks.load_track_meta()
-                entry: Dict[str, Any] = meta.get(wav_path.name, {})
+                with cdmf_tracks.update_track_meta() as meta:
+                    entry: Dict[str, Any] = meta.get(wav_path.name, {})
 
-                if "favorite" not in entry:
-                    entry["favorite"] = False
+                    if "favorite" not in entry:
+                        entry["favorite"] = False
 
-                if preset_category and not entry.get("category"):
-                    entry["category"] = preset_category
+                    if preset_category and not entry.get("category"):
+                        entry["category"] = preset_category
 
-                try:
-                    entry["seconds"] = float(summary.get("actual_seconds") or 0.0)
-                except Exception:
-                    entry["seconds"] = float(entry.get("seconds") or 0.0)
-
-                if bpm is not None:
                     try:
-                        entry["bpm"] = float(bpm)
+                        entry["seconds"] = float(summary.get("actual_seconds") or 0.0)
                     except Exception:
-                        pass
-
-                if preset_id:
-                    entry["preset_id"] = preset_id
-
-                if not entry.get("created"):
-                    entry["created"] = time.time()
-
-                entry["prompt"] = prompt
-                entry["lyrics"] = lyrics
-                entry["instrumental"] = bool(instrumental)
-                entry["seed"] = int(summary.get("seed", seed))
-                entry["seed_vibe"] = seed_vibe
-                entry["target_seconds"] = float(target_seconds)
-                entry["fade_in"] = float(fade_in)
-                entry["fade_out"] = float(fade_out)
-                entry["vocal_gain_db"] = float(
-                    summary.get("vocal_gain_db", vocal_gain_db)
-                )
-                entry["instrumental_gain_db"] = float(
-                    summary.get("instrumental_gain_db", instrumental_gain_db)
-                )
-                entry["steps"] = int(steps)
-                entry["guidance_scale"] = float(guidance_scale)
-                entry["basename"] = basename
-                entry["out_dir"] = str(out_dir_path)
-                entry["negative_prompt"] = negative_prompt
-                entry["preset_category"] = preset_category or entry.get("category", "")
-
-                entry["scheduler_type"] = summary.get("scheduler_type")
-                entry["cfg_type"] = summary.get("cfg_type")
-                entry["omega_scale"] = summary.get("omega_scale")
-                entry["guidance_interval"] = summary.get("guidance_interval")
-                entry["guidance_interval_decay"] = summary.get("guidance_interval_decay")
-                entry["min_guidance_scale"] = summary.get("min_guidance_scale")
-                entry["use_erg_tag"] = summary.get("use_erg_tag")
-                entry["use_erg_lyric"] = summary.get("use_erg_lyric")
-                entry["use_erg_diffusion"] = summary.get("use_erg_diffusion")
-                entry["oss_steps"] = summary.get("oss_steps")
-                entry["task"] = summary.get("task")
-                entry["repaint_start"] = summary.get("repaint_start")
-                entry["repaint_end"] = summary.get("repaint_end")
-                entry["retake_variance"] = summary.get("retake_variance")
-                entry["audio2audio_enable"] = summary.get("audio2audio_enable")
-                entry["ref_audio_strength"] = summary.get("ref_audio_strength")
-                entry["src_audio_path"] = summary.get("src_audio_path")
-                entry["lora_name_or_path"] = summary.get(
-                    "lora_name_or_path", lora_name_or_path
-                )
-                entry["lora_weight"] = summary.get("lora_weight", lora_weight)
-                entry["generator"] = "gen"
-                tags = list(entry.get("tags") or [])
-                if "generation" not in tags:
-                    tags.append("generation")
-                entry["tags"] = tags
-                # Save input file as full path when available
-                if src_audio_path:
-                    entry["input_file"] = src_audio_path
-                    entry["input_file_path"] = src_audio_path
-                    entry["src_audio_path"] = src_audio_path  # Keep for backward compatibility
-                elif ref_audio_filename:
-                    entry["input_file"] = ref_audio_filename  # Fallback: filename only (legacy)
-
-                meta[wav_path.name] = entry
-                cdmf_tracks.save_track_meta(meta)
+                        entry["seconds"] = float(entry.get("seconds") or 0.0)
+
+                    if bpm is not None:
+                        try:
+                            entry["bpm"] = float(bpm)
+                        except Exception:
+                            pass
+
+                    if preset_id:
+                        entry["preset_id"] = preset_id
+
+                    if not entry.get("created"):
+                        entry["created"] = time.time()
+
+                    entry["prompt"] = prompt
+                    entry["lyrics"] = lyrics
+                    entry["instrumental"] = bool(instrumental)
+                    entry["seed"] = int(summary.get("seed", seed))
+                    entry["seed_vibe"] = seed_vibe
+                    entry["target_seconds"] = float(target_seconds)
+                    entry["fade_in"] = float(fade_in)
+                    entry["fade_out"] = float(fade_out)
+                    entry["vocal_gain_db"] = float(
+                        summary.get("vocal_gain_db", vocal_gain_db)
+                    )
+                    entry["instrumental_gain_db"] = float(
+                        summary.get("instrumental_gain_db", instrumental_gain_db)
+                    )
+                    entry["steps"] = int(steps)
+                    entry["guidance_scale"] = float(guidance_scale)
+                    entry["basename"] = basename
+                    entry["out_dir"] = str(out_dir_path)
+                    entry["negative_prompt"] = negative_prompt
+                    entry["preset_category"] = preset_category or entry.get("category", "")
+
+                    entry["scheduler_type"] = summary.get("scheduler_type")
+                    entry["cfg_type"] = summary.get("cfg_type")
+                    entry["omega_scale"] = summary.get("omega_scale")
+                    entry["guidance_interval"] = summary.get("guidance_interval")
+                    entry["guidance_interval_decay"] = summary.get("guidance_interval_decay")
+                    entry["min_guidance_scale"] = summary.get("min_guidance_scale")
+                    entry["use_erg_tag"] = summary.get("use_erg_tag")
+                    entry["use_erg_lyric"] = summary.get("use_erg_lyric")
+                    entry["use_erg_diffusion"] = summary.get("use_erg_diffusion")
+                    entry["oss_steps"] = summary.get("oss_steps")
+                    entry["task"] = summary.get("task")
+                    entry["repaint_start"] = summary.get("repaint_start")
+                    entry["repaint_end"] = summary.get("repaint_end")
+                    entry["retake_variance"] = summary.get("retake_variance")
+                    entry["audio2audio_enable"] = summary.get("audio2audio_enable")
+                    entry["ref_audio_strength"] = summary.get("ref_audio_strength")
+                    entry["src_audio_path"] = summary.get("src_audio_path")
+                    entry["lora_name_or_path"] = summary.get(
+                        "lora_name_or_path", lora_name_or_path
+                    )
+                    entry["lora_weight"] = summary.get("lora_weight", lora_weight)
+                    entry["generator"] = "gen"
+                    tags = list(entry.get("tags") or [])
+                    if "generation" not in tags:
+                        tags.append("generation")
+                    entry["tags"] = tags
+                    # Save input file as full path when available
+                    if src_audio_path:
+                        entry["input_file"] = src_audio_path
+                        entry["input_file_path"] = src_audio_path
+                        entry["src_audio_path"] = src_audio_path  # Keep for backward compatibility
+                    elif ref_audio_filename:
+                        entry["input_file"] = ref_audio_filename  # Fallback: filename only (legacy)
+
+                    meta[wav_path.name] = entry
             except Exception as e:
                 safe_name = getattr(wav_path, "name", repr(wav_path))
                 print(
@@ -613,7 +667,7 @@ def create_generation_blueprint(
             if wav_path.parent.resolve() == Path(get_output_dir()).resolve():
                 current_track = wav_path.name
 
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["current"] = 1.0
                 cdmf_state.GENERATION_PROGRESS["total"] = 1.0
                 cdmf_state.GENERATION_PROGRESS["stage"] = "done"
@@ -642,8 +696,8 @@ def create_generation_blueprint(
             ]
             details = "\n".join(str(x) for x in detail_lines if x)
 
-            return render_template_string(
-                html_template,
+            return render_template(
+                UI_TEMPLATE_NAME,
                 version=APP_VERSION,
                 prompt=prompt,
                 negative_prompt=negative_prompt,
@@ -694,13 +748,13 @@ def create_generation_blueprint(
             tracks = cdmf_tracks.list_music_files()
             current_track = tracks[-1] if tracks else None
 
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["error"] = True
                 cdmf_state.GENERATION_PROGRESS["done"] = True
                 cdmf_state.GENERATION_PROGRESS["stage"] = "error"
 
-            return render_template_string(
-                html_template,
+            return render_template(
+                UI_TEMPLATE_NAME,
                 version=APP_VERSION,
                 prompt=prompt,
                 negative_prompt=negative_prompt,
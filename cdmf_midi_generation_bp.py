@@ -152,34 +152,33 @@ def create_midi_generation_blueprint(html_template: str) -> Blueprint:
                     
                     # For MIDI files, we can't easily get duration without converting
                     # Just save basic metadata
-                    track_meta = cdmf_tracks.load_track_meta()
-                    midi_filename = Path(result_path).name
+                    with cdmf_tracks.update_track_meta() as track_meta:
+                        midi_filename = Path(result_path).name
                     
-                    entry = track_meta.get(midi_filename, {})
-                    if "favorite" not in entry:
-                        entry["favorite"] = False
-                    entry["created"] = time.time()
-                    entry["generator"] = "midi"
-                    entry["basename"] = Path(midi_filename).stem
-                    # original_file already saved below
-                    entry["onset_threshold"] = onset_threshold
-                    entry["frame_threshold"] = frame_threshold
-                    entry["minimum_note_length_ms"] = minimum_note_length_ms
-                    entry["minimum_frequency"] = minimum_frequency
-                    entry["maximum_frequency"] = maximum_frequency
-                    entry["multiple_pitch_bends"] = multiple_pitch_bends
-                    entry["melodia_trick"] = melodia_trick
-                    entry["midi_tempo"] = midi_tempo
-                    entry["out_dir"] = str(out_dir_path)
-                    entry["original_file"] = str(temp_input_path)
-                    entry["input_file"] = str(temp_input_path)  # Full path for consistency
-                    tags = list(entry.get("tags") or [])
-                    if "midi" not in tags:
-                        tags.append("midi")
-                    entry["tags"] = tags
-                    track_meta[midi_filename] = entry
+                        entry = track_meta.get(midi_filename, {})
+                        if "favorite" not in entry:
+                            entry["favorite"] = False
+                        entry["created"] = time.time()
+                        entry["generator"] = "midi"
+                        entry["basename"] = Path(midi_filename).stem
+                        # original_file already saved below
+                        entry["onset_threshold"] = onset_threshold
+                        entry["frame_threshold"] = frame_threshold
+                        entry["minimum_note_length_ms"] = minimum_note_length_ms
+                        entry["minimum_frequency"] = minimum_frequency
+                        entry["maximum_frequency"] = maximum_frequency
+                        entry["multiple_pitch_bends"] = multiple_pitch_bends
+                        entry["melodia_trick"] = melodia_trick
+                        entry["midi_tempo"] = midi_tempo
+                        entry["out_dir"] = str(out_dir_path)
+                        entry["original_file"] = str(temp_input_path)
+                        entry["input_file"] = str(temp_input_path)  # Full path for consistency
+                        tags = list(entry.get("tags") or [])
+                        if "midi" not in tags:
+                            tags.append("midi")
+                        entry["tags"] = tags
+                        track_meta[midi_filename] = entry
                     
-                    cdmf_tracks.save_track_meta(track_meta)
                 except Exception as e:
                     from cdmf_ffmpeg import FFMPEG_INSTALL_HINT, is_ffmpeg_not_found_error
                     
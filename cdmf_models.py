@@ -17,7 +17,7 @@ def _download_models_worker() -> None:
     """
     # Reset and announce that we're downloading the ACE model.
     cdmf_state.reset_progress()
-    with cdmf_state.PROGRESS_LOCK:
+    with cdmf_state.progress_update():
         cdmf_state.GENERATION_PROGRESS["stage"] = "ace_model_download"
         cdmf_state.GENERATION_PROGRESS["done"] = False
         cdmf_state.GENERATION_PROGRESS["error"] = False
@@ -31,7 +31,7 @@ def _download_models_worker() -> None:
             cdmf_state.MODEL_STATUS["message"] = "ACE-Step model is present."
 
         # Snap to 100% on success.
-        with cdmf_state.PROGRESS_LOCK:
+        with cdmf_state.progress_update():
             cdmf_state.GENERATION_PROGRESS["current"] = 1.0
             cdmf_state.GENERATION_PROGRESS["total"] = 1.0
             cdmf_state.GENERATION_PROGRESS["stage"] = "done"
@@ -43,7 +43,7 @@ def _download_models_worker() -> None:
             cdmf_state.MODEL_STATUS["message"] = f"Failed to download ACE-Step model: {exc}"
 
         # Mark the progress bar as errored.
-        with cdmf_state.PROGRESS_LOCK:
+        with cdmf_state.progress_update():
             cdmf_state.GENERATION_PROGRESS["stage"] = "error"
             cdmf_state.GENERATION_PROGRESS["done"] = True
             cdmf_state.GENERATION_PROGRESS["error"] = True
@@ -154,7 +154,7 @@ def create_models_blueprint() -> Blueprint:
         def _download_stem_split_models_worker() -> None:
             """Background worker to pre-download Demucs model."""
             cdmf_state.reset_progress()
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["stage"] = "stem_split_model_download"
                 cdmf_state.GENERATION_PROGRESS["done"] = False
                 cdmf_state.GENERATION_PROGRESS["error"] = False
@@ -162,13 +162,13 @@ def create_models_blueprint() -> Blueprint:
                 cdmf_state.GENERATION_PROGRESS["total"] = 1.0
             try:
                 def _progress(f: float) -> None:
-                    with cdmf_state.PROGRESS_LOCK:
+                    with cdmf_state.progress_update():
                         cdmf_state.GENERATION_PROGRESS["current"] = max(0.0, min(1.0, f))
                 ensure_stem_split_models(progress_cb=_progress)
                 with cdmf_state.STEM_SPLIT_LOCK:
                     cdmf_state.STEM_SPLIT_STATUS["state"] = "ready"
                     cdmf_state.STEM_SPLIT_STATUS["message"] = "Demucs model is present."
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["current"] = 1.0
                     cdmf_state.GENERATION_PROGRESS["stage"] = "done"
                     cdmf_state.GENERATION_PROGRESS["done"] = True
@@ -177,7 +177,7 @@ def create_models_blueprint() -> Blueprint:
                 with cdmf_state.STEM_SPLIT_LOCK:
                     cdmf_state.STEM_SPLIT_STATUS["state"] = "error"
                     cdmf_state.STEM_SPLIT_STATUS["message"] = f"Failed to download Demucs model: {exc}"
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["stage"] = "error"
                     cdmf_state.GENERATION_PROGRESS["done"] = True
                     cdmf_state.GENERATION_PROGRESS["error"] = True
@@ -236,7 +236,7 @@ def create_models_blueprint() -> Blueprint:
         def _download_voice_clone_models_worker() -> None:
             """Background worker to pre-download and load TTS/XTTS model."""
             cdmf_state.reset_progress()
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["stage"] = "voice_clone_model_download"
                 cdmf_state.GENERATION_PROGRESS["done"] = False
                 cdmf_state.GENERATION_PROGRESS["error"] = False
@@ -244,13 +244,13 @@ def create_models_blueprint() -> Blueprint:
                 cdmf_state.GENERATION_PROGRESS["total"] = 1.0
             try:
                 def _progress(f: float) -> None:
-                    with cdmf_state.PROGRESS_LOCK:
+                    with cdmf_state.progress_update():
                         cdmf_state.GENERATION_PROGRESS["current"] = max(0.0, min(1.0, f))
                 ensure_voice_clone_models(device_preference="auto", progress_cb=_progress)
                 with cdmf_state.VOICE_CLONE_LOCK:
                     cdmf_state.VOICE_CLONE_STATUS["state"] = "ready"
                     cdmf_state.VOICE_CLONE_STATUS["message"] = "XTTS voice cloning model is ready."
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["current"] = 1.0
                     cdmf_state.GENERATION_PROGRESS["stage"] = "done"
                     cdmf_state.GENERATION_PROGRESS["done"] = True
@@ -259,7 +259,7 @@ def create_models_blueprint() -> Blueprint:
                 with cdmf_state.VOICE_CLONE_LOCK:
                     cdmf_state.VOICE_CLONE_STATUS["state"] = "error"
                     cdmf_state.VOICE_CLONE_STATUS["message"] = f"Failed to load voice cloning model: {exc}"
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["stage"] = "error"
                     cdmf_state.GENERATION_PROGRESS["done"] = True
                     cdmf_state.GENERATION_PROGRESS["error"] = True
@@ -318,7 +318,7 @@ def create_models_blueprint() -> Blueprint:
         def _download_midi_models_worker() -> None:
             """Background worker to pre-download basic-pitch model."""
             cdmf_state.reset_progress()
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["stage"] = "midi_model_download"
                 cdmf_state.GENERATION_PROGRESS["done"] = False
                 cdmf_state.GENERATION_PROGRESS["error"] = False
@@ -326,13 +326,13 @@ def create_models_blueprint() -> Blueprint:
                 cdmf_state.GENERATION_PROGRESS["total"] = 1.0
             try:
                 def _progress(f: float) -> None:
-                    with cdmf_state.PROGRESS_LOCK:
+                    with cdmf_state.progress_update():
                         cdmf_state.GENERATION_PROGRESS["current"] = max(0.0, min(1.0, f))
                 ensure_basic_pitch_models(progress_cb=_progress)
                 with cdmf_state.MIDI_GEN_LOCK:
                     cdmf_state.MIDI_GEN_STATUS["state"] = "ready"
                     cdmf_state.MIDI_GEN_STATUS["message"] = "basic-pitch model is present."
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["current"] = 1.0
                     cdmf_state.GENERATION_PROGRESS["stage"] = "done"
                     cdmf_state.GENERATION_PROGRESS["done"] = True
@@ -341,7 +341,7 @@ def create_models_blueprint() -> Blueprint:
                 with cdmf_state.MIDI_GEN_LOCK:
                     cdmf_state.MIDI_GEN_STATUS["state"] = "error"
                     cdmf_state.MIDI_GEN_STATUS["message"] = f"Failed to download basic-pitch model: {exc}"
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["stage"] = "error"
                     cdmf_state.GENERATION_PROGRESS["done"] = True
                     cdmf_state.GENERATION_PROGRESS["error"] = True
@@ -259,17 +259,19 @@ def get_app_version() -> str:
         # For development, just check APP_DIR (project root)
         candidates.append(APP_DIR / "VERSION")
     
-    # Try each candidate location
+    # Try each candidate location (open directly: a missing file costs one
+    # failed open instead of a stat, and a present one no extra stat)
     for version_file in candidates:
-        if version_file.exists():
-            try:
-                with version_file.open("r", encoding="utf-8") as f:
-                    version = f.read().strip()
-                    if version:
-                        print(f"[AceForge] Loaded version '{version}' from {version_file}", flush=True)
-                        return version
-            except Exception as e:
-                print(f"[AceForge] Warning: Failed to read VERSION file from {version_file}: {e}", flush=True)
+        try:
+            with version_file.open("r", encoding="utf-8") as f:
+                version = f.read().strip()
+                if version:
+                    print(f"[AceForge] Loaded version '{version}' from {version_file}", flush=True)
+                    return version
+        except FileNotFoundError:
+            continue
+        except Exception as e:
+            print(f"[AceForge] Warning: Failed to read VERSION file from {version_file}: {e}", flush=True)
     
     # Default fallback for development builds
     print(f"[AceForge] No VERSION file found, using default 'dev'", flush=True)
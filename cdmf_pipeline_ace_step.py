@@ -6,6 +6,7 @@ https://github.com/ace-step/ACE-Step
 Apache 2.0 License
 """
 
+import gc
 import random
 import time
 import os
@@ -413,23 +414,26 @@ class ACEStepPipeline:
 
     def cleanup_memory(self):
         """Clean up GPU and CPU memory to prevent VRAM overflow during multiple generations."""
-        # Clear device cache based on device type
-        if torch.cuda.is_available() and self.device.type == "cuda":
-            torch.cuda.empty_cache()
+        # Clear device cache based on device type. empty_cache() synchronizes the
+        # device, so skip it when the caching allocator holds nothing (reserved,
+        # not just allocated, bytes - cached free blocks are what it releases).
+        if self.device.type == "cuda" and torch.cuda.is_available():
+            if torch.cuda.memory_reserved() > 0:
+                torch.cuda.empty_cache()
             # Log memory usage if in verbose mode
             allocated = torch.cuda.memory_allocated() / (1024 ** 3)
             reserved = torch.cuda.memory_reserved() / (1024 ** 3)
             logger.info(f"GPU Memory: {allocated:.2f}GB allocated, {reserved:.2f}GB reserved")
-        elif hasattr(torch.backends, "mps") and torch.backends.mps.is_available() and self.device.type == "mps":
+        elif self.device.type == "mps" and hasattr(torch.backends, "mps") and torch.backends.mps.is_available():
             # MPS (Metal Performance Shaders) cache clearing
             try:
-                torch.mps.empty_cache()
-                logger.info("MPS Memory cache cleared")
+                if torch.mps.driver_allocated_memory() > 0:
+                    torch.mps.empty_cache()
+                    logger.info("MPS Memory cache cleared")
             except Exception as e:
                 logger.debug(f"MPS cache clear not available: {e}")
 
         # Collect Python garbage
-        import gc
         gc.collect()
 
     def get_checkpoint_path(self, checkpoint_dir, repo):
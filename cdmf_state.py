@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
+import contextlib
 import threading
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
 
 from ace_model_setup import ace_models_present
 
@@ -31,6 +32,10 @@ def get_current_generation_job_id() -> Optional[str]:
 # ---------------------------------------------------------------------------
 
 PROGRESS_LOCK = threading.Lock()
+# Signalled by progress_update() when GENERATION_PROGRESS actually changed;
+# /progress/stream sleeps on it instead of polling
+_PROGRESS_CHANGED = threading.Condition(PROGRESS_LOCK)
+_PROGRESS_VERSION = 0
 GENERATION_PROGRESS: Dict[str, Any] = {
     "current": 0.0,
     "total": 1.0,
@@ -128,31 +133,68 @@ TRAIN_STATE: Dict[str, Any] = {
 # Progress helpers
 # ---------------------------------------------------------------------------
 
-def reset_progress() -> None:
+def get_progress_snapshot() -> Dict[str, Any]:
+    """
+    Consistent copy of GENERATION_PROGRESS. The copy is a single C-level
+    operation, so pollers hold PROGRESS_LOCK for as short as possible.
+    """
     with PROGRESS_LOCK:
-        GENERATION_PROGRESS["current"] = 0.0
-        GENERATION_PROGRESS["total"] = 1.0
-        GENERATION_PROGRESS["stage"] = ""
-        GENERATION_PROGRESS["done"] = False
-        GENERATION_PROGRESS["error"] = False
+        return dict(GENERATION_PROGRESS)
 
 
-def mark_running(stage: str = "ACE") -> None:
+@contextlib.contextmanager
+def progress_update() -> Iterator[Dict[str, Any]]:
+    """
+    Hold PROGRESS_LOCK while updating GENERATION_PROGRESS (yielded), then wake
+    wait_for_progress_change() if the contents changed. Plain
+    `with PROGRESS_LOCK:` blocks (reads, LAST_GENERATED_TRACK) wake nobody.
+    """
+    global _PROGRESS_VERSION
     with PROGRESS_LOCK:
-        GENERATION_PROGRESS["current"] = 0.0
-        GENERATION_PROGRESS["total"] = 1.0
-        GENERATION_PROGRESS["stage"] = stage
-        GENERATION_PROGRESS["done"] = False
-        GENERATION_PROGRESS["error"] = False
+        before = dict(GENERATION_PROGRESS)
+        try:
+            yield GENERATION_PROGRESS
+        finally:
+            if GENERATION_PROGRESS != before:
+                _PROGRESS_VERSION += 1
+                _PROGRESS_CHANGED.notify_all()
 
 
-def mark_done(stage: str = "done") -> None:
+def progress_version() -> int:
+    """Change counter for GENERATION_PROGRESS, for wait_for_progress_change()."""
     with PROGRESS_LOCK:
-        GENERATION_PROGRESS["current"] = 1.0
-        GENERATION_PROGRESS["total"] = 1.0
-        GENERATION_PROGRESS["stage"] = stage
-        GENERATION_PROGRESS["done"] = True
-        GENERATION_PROGRESS["error"] = False
+        return _PROGRESS_VERSION
+
+
+def wait_for_progress_change(seen_version: int, timeout: float) -> int:
+    """
+    Block until progress_update() has changed GENERATION_PROGRESS since
+    `seen_version` was read from progress_version(), or `timeout` seconds
+    pass. Returns the current version (unchanged on timeout).
+    """
+    with _PROGRESS_CHANGED:
+        _PROGRESS_CHANGED.wait_for(lambda: _PROGRESS_VERSION != seen_version, timeout)
+        return _PROGRESS_VERSION
+
+
+def _set_progress(current: float, stage: str, done: bool = False) -> None:
+    # One dict.update() per change instead of five item stores under the lock
+    with progress_update():
+        GENERATION_PROGRESS.update(
+            current=current, total=1.0, stage=stage, done=done, error=False
+        )
+
+
+def reset_progress() -> None:
+    _set_progress(0.0, "")
+
+
+def mark_running(stage: str = "ACE") -> None:
+    _set_progress(0.0, stage)
+
+
+def mark_done(stage: str = "done") -> None:
+    _set_progress(1.0, stage, done=True)
 
 
 def ace_progress_callback(fraction: float, stage: str) -> None:
@@ -160,16 +202,11 @@ def ace_progress_callback(fraction: float, stage: str) -> None:
     Callback invoked from generate_ace.generate_track_ace to update UI progress.
     This is wired via register_progress_callback() in music_forge_ui.py.
     """
-    with PROGRESS_LOCK:
-        try:
-            frac = max(0.0, min(1.0, float(fraction)))
-        except Exception:
-            frac = 0.0
-        GENERATION_PROGRESS["current"] = frac
-        GENERATION_PROGRESS["total"] = 1.0
-        GENERATION_PROGRESS["stage"] = stage or "ace"
-        GENERATION_PROGRESS["done"] = False
-        GENERATION_PROGRESS["error"] = False
+    try:
+        frac = max(0.0, min(1.0, float(fraction)))
+    except Exception:
+        frac = 0.0
+    _set_progress(frac, stage or "ace")
 
 
 def model_download_progress_cb(fraction: float) -> None:
@@ -178,20 +215,15 @@ def model_download_progress_cb(fraction: float) -> None:
     ace_model_setup.ensure_ace_models(). This drives the same progress bar
     that generation uses, but with a distinct stage label.
     """
-    with PROGRESS_LOCK:
-        try:
-            frac = max(0.0, min(1.0, float(fraction)))
-        except Exception:
-            frac = 0.0
-
-        # Leave a bit of headroom so we still visibly "finish" at 1.0 later.
-        frac = 0.05 + 0.9 * frac  # map 0..1 → 0.05..0.95
-
-        GENERATION_PROGRESS["current"] = frac
-        GENERATION_PROGRESS["total"] = 1.0
-        GENERATION_PROGRESS["stage"] = "ace_model_download"
-        GENERATION_PROGRESS["done"] = False
-        GENERATION_PROGRESS["error"] = False
+    try:
+        frac = max(0.0, min(1.0, float(fraction)))
+    except Exception:
+        frac = 0.0
+
+    # Leave a bit of headroom so we still visibly "finish" at 1.0 later.
+    frac = 0.05 + 0.9 * frac  # map 0..1 → 0.05..0.95
+
+    _set_progress(frac, "ace_model_download")
 
 
 # ---------------------------------------------------------------------------
@@ -100,7 +100,7 @@ def create_stem_splitting_blueprint(html_template: str) -> Blueprint:
             try:
                 # Reset progress
                 cdmf_state.reset_progress()
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["current"] = 0.0
                     cdmf_state.GENERATION_PROGRESS["total"] = 1.0
                     cdmf_state.GENERATION_PROGRESS["stage"] = "stem_split"
@@ -139,8 +139,9 @@ def create_stem_splitting_blueprint(html_template: str) -> Blueprint:
                 
                 # Save track metadata for Music Player so stems appear in library
                 # Each stem gets its own metadata entry; never fail the request if metadata has issues
-                track_meta = cdmf_tracks.load_track_meta()
                 base_filename_form = request.form.get("base_filename", "").strip()
+                # Decode durations first; the metadata update below holds the meta lock
+                durations = {}
                 for stem_name, stem_path in stem_files.items():
                     stem_filename = Path(stem_path).name
                     dur = 0.0
@@ -156,35 +157,38 @@ def create_stem_splitting_blueprint(html_template: str) -> Blueprint:
                             except Exception:
                                 pass
                         logger.debug("[Stem Splitting] Duration for %s: %s (fallback used)", stem_filename, e)
-                    entry = track_meta.get(stem_filename, {})
-                    if "favorite" not in entry:
-                        entry["favorite"] = False
-                    entry["seconds"] = dur
-                    entry["created"] = time.time()
-                    entry["generator"] = "stem"
-                    entry["basename"] = Path(stem_filename).stem
-                    entry["stem_name"] = stem_name
-                    entry["stem_count"] = stem_count
-                    entry["mode"] = mode or ""
-                    entry["export_format"] = export_format
-                    entry["device_preference"] = device_preference
-                    entry["out_dir"] = str(out_dir_path)
-                    entry["original_file"] = str(temp_input_path)
-                    entry["input_file"] = str(temp_input_path)
-                    tags = list(entry.get("tags") or [])
-                    if "stems" not in tags:
-                        tags.append("stems")
-                    entry["tags"] = tags
-                    if base_filename_form:
-                        entry["base_filename"] = base_filename_form
-                    track_meta[stem_filename] = entry
+                    durations[stem_name] = dur
                 try:
-                    cdmf_tracks.save_track_meta(track_meta)
+                    with cdmf_tracks.update_track_meta() as track_meta:
+                        for stem_name, stem_path in stem_files.items():
+                            stem_filename = Path(stem_path).name
+                            entry = track_meta.get(stem_filename, {})
+                            if "favorite" not in entry:
+                                entry["favorite"] = False
+                            entry["seconds"] = durations[stem_name]
+                            entry["created"] = time.time()
+                            entry["generator"] = "stem"
+                            entry["basename"] = Path(stem_filename).stem
+                            entry["stem_name"] = stem_name
+                            entry["stem_count"] = stem_count
+                            entry["mode"] = mode or ""
+                            entry["export_format"] = export_format
+                            entry["device_preference"] = device_preference
+                            entry["out_dir"] = str(out_dir_path)
+                            entry["original_file"] = str(temp_input_path)
+                            entry["input_file"] = str(temp_input_path)
+                            tags = list(entry.get("tags") or [])
+                            if "stems" not in tags:
+                                tags.append("stems")
+                            entry["tags"] = tags
+                            if base_filename_form:
+                                entry["base_filename"] = base_filename_form
+                            track_meta[stem_filename] = entry
                 except Exception as e:
                     logger.warning("[Stem Splitting] Failed to save track metadata: %s", e)
                 
                 # Mark progress as done
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["current"] = 1.0
                     cdmf_state.GENERATION_PROGRESS["total"] = 1.0
                     cdmf_state.GENERATION_PROGRESS["stage"] = "stem_split_done"
@@ -213,7 +217,7 @@ def create_stem_splitting_blueprint(html_template: str) -> Blueprint:
                 except Exception:
                     pass
                 # Mark progress as error
-                with cdmf_state.PROGRESS_LOCK:
+                with cdmf_state.progress_update():
                     cdmf_state.GENERATION_PROGRESS["error"] = True
                     cdmf_state.GENERATION_PROGRESS["done"] = True
                     cdmf_state.GENERATION_PROGRESS["stage"] = "stem_split_error"
@@ -223,7 +227,7 @@ def create_stem_splitting_blueprint(html_template: str) -> Blueprint:
             tb = traceback.format_exc()
             logger.error(f"[Stem Splitting] Error: {e}\n{tb}")
             # Mark progress as error
-            with cdmf_state.PROGRESS_LOCK:
+            with cdmf_state.progress_update():
                 cdmf_state.GENERATION_PROGRESS["error"] = True
                 cdmf_state.GENERATION_PROGRESS["done"] = True
                 cdmf_state.GENERATION_PROGRESS["stage"] = "stem_split_error"
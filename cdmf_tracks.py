@@ -2,15 +2,24 @@
 
 from __future__ import annotations
 
+import atexit
+import contextlib
 import json
 import os
 import platform
+import stat
 import subprocess
+import threading
 import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List, Tuple
 
-from flask import Blueprint, request, jsonify, send_from_directory
+from flask import Blueprint, Response, request, jsonify, send_from_directory
+
+try:
+    import orjson  # pinned in requirements_ace*.txt; several times faster than json
+except ImportError:
+    orjson = None
 
 import cdmf_state
 from cdmf_paths import (
@@ -26,47 +35,196 @@ from cdmf_paths import (
 # ---------------------------------------------------------------------------
 
 
+def _read_json_file(path: Path) -> Any:
+    """Parse a JSON file (orjson when available, json for anything it rejects)."""
+    if orjson is not None:
+        raw = path.read_bytes()
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # e.g. NaN written by an older json.dump; let json decide
+            pass
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json_file(path: Path, data: Any) -> None:
+    """
+    Write `data` as indented, key-sorted JSON (same layout with or without orjson).
+    The bytes go to a temp file that then replaces `path`, so a crash mid-write
+    never leaves a truncated file (which would load as empty and be saved back).
+
+    Note: orjson writes NaN/Infinity as null, where json would emit the
+    non-standard NaN token; readers of these files treat null as "unset".
+    """
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+        except TypeError:
+            # Non-str keys, out-of-range ints, ...: fall back to json
+            payload = None
+    if payload is None:
+        payload = json.dumps(data, indent=2, sort_keys=True).encode("utf-8")
+
+    # Unique per writer thread: concurrent saves of the same file must never
+    # interleave in (or os.replace) each other's temp file
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# presets.json ships with the app; parsed once and reused until its mtime changes
+_PRESETS_CACHE: Dict[str, Any] = {"mtime": None, "data": None}
+
+
 def load_presets() -> Dict[str, Any]:
     """
     Load preset definitions from presets.json (if present).
     Returns a dict with "instrumental" and "vocal" arrays.
+    The dict is shared between calls; treat it as read-only.
     """
     try:
-        with PRESETS_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        mtime = PRESETS_PATH.stat().st_mtime_ns
+        cached = _PRESETS_CACHE["data"]
+        if cached is not None and _PRESETS_CACHE["mtime"] == mtime:
+            return cached
+
+        data = _read_json_file(PRESETS_PATH)
         if not isinstance(data, dict):
             raise ValueError("presets.json must contain an object at the top level.")
         data.setdefault("instrumental", [])
         data.setdefault("vocal", [])
+        _PRESETS_CACHE["data"] = data
+        _PRESETS_CACHE["mtime"] = mtime
         return data
     except Exception as e:
         print(f"[AceForge] Failed to load presets.json: {e}", flush=True)
         return {"instrumental": [], "vocal": []}
 
 
+# In-memory copy of tracks_meta.json. Reused while the file's mtime is
+# unchanged; a pending (not yet written) save always wins over the file.
+# Reentrant: update_track_meta() holds it across its own load and save.
+_META_LOCK = threading.RLock()
+_META_CACHE: Dict[str, Any] = {"mtime": None, "data": None, "dirty": False}
+_META_TIMER = None
+# Bursts of saves (favorite toggles, batch renames) collapse into one write
+_META_SAVE_DELAY = 0.25
+
+
+def _copy_track_meta(data: Any) -> Any:
+    # Callers edit entries in place (including nested settings lists/dicts)
+    # before saving; copy the whole JSON tree so an abandoned edit never leaks
+    # into the cache. Cheaper than copy.deepcopy for plain JSON values.
+    if isinstance(data, dict):
+        return {k: _copy_track_meta(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_copy_track_meta(v) for v in data]
+    return data
+
+
+def _track_meta_mtime():
+    try:
+        return TRACK_META_PATH.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def load_track_meta() -> Dict[str, Any]:
     """
     Load per-track metadata (favorites, categories, etc.) from disk.
     """
-    try:
-        with TRACK_META_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-        if not isinstance(data, dict):
+    with _META_LOCK:
+        mtime = None if _META_CACHE["dirty"] else _track_meta_mtime()
+        if _META_CACHE["data"] is not None and (
+            _META_CACHE["dirty"] or (mtime is not None and mtime == _META_CACHE["mtime"])
+        ):
+            return _copy_track_meta(_META_CACHE["data"])
+
+        try:
+            data = _read_json_file(TRACK_META_PATH)
+            if not isinstance(data, dict):
+                data = {}
+        except Exception:
             return {}
-        return data
-    except Exception:
-        return {}
+        _META_CACHE["mtime"] = mtime
+        _META_CACHE["data"] = data
+        return _copy_track_meta(data)
+
+
+def flush_track_meta() -> None:
+    """Write a pending save_track_meta() to disk now (no-op if nothing is pending)."""
+    global _META_TIMER
+    with _META_LOCK:
+        if _META_TIMER is not None:
+            _META_TIMER.cancel()
+            _META_TIMER = None
+        if not _META_CACHE["dirty"]:
+            return
+        try:
+            _write_json_file(TRACK_META_PATH, _META_CACHE["data"])
+        except Exception as e:
+            print(f"[AceForge] Failed to save tracks_meta.json: {e}", flush=True)
+        _META_CACHE["dirty"] = False
+        _META_CACHE["mtime"] = _track_meta_mtime()
 
 
 def save_track_meta(meta: Dict[str, Any]) -> None:
     """
     Persist per-track metadata back to disk.
+
+    The write is deferred by _META_SAVE_DELAY and restarted by every further
+    save, so only the last state of a burst hits the disk. load_track_meta()
+    sees the pending state immediately; flush_track_meta() forces the write.
     """
-    try:
-        with TRACK_META_PATH.open("w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, sort_keys=True)
-    except Exception as e:
-        print(f"[AceForge] Failed to save tracks_meta.json: {e}", flush=True)
+    global _META_TIMER
+    with _META_LOCK:
+        _META_CACHE["data"] = _copy_track_meta(meta)
+        _META_CACHE["dirty"] = True
+        if _META_TIMER is not None:
+            _META_TIMER.cancel()
+        _META_TIMER = threading.Timer(_META_SAVE_DELAY, flush_track_meta)
+        _META_TIMER.daemon = True
+        _META_TIMER.start()
+
+
+@contextlib.contextmanager
+def update_track_meta() -> Iterator[Dict[str, Any]]:
+    """
+    Read-modify-write of the track metadata as one step.
+
+    Yields the loaded metadata for in-place edits and saves it when the block
+    exits normally (an exception discards the edits). Holds _META_LOCK
+    throughout, so concurrent updates can't drop each other's changes; keep
+    slow work (audio decoding etc.) outside the block.
+    """
+    with _META_LOCK:
+        meta = load_track_meta()
+        yield meta
+        save_track_meta(meta)
+
+
+# Daemon timer threads don't outlive the interpreter; write any pending save
+atexit.register(flush_track_meta)
+
+
+# Held across the read-modify-write of user_presets.json (the /user_presets
+# route) and by save_user_presets(), so concurrent edits don't drop each other
+_USER_PRESETS_LOCK = threading.RLock()
 
 
 def load_user_presets() -> Dict[str, Any]:
@@ -77,8 +235,7 @@ def load_user_presets() -> Dict[str, Any]:
       { "id", "label", ...settings... }
     """
     try:
-        with USER_PRESETS_PATH.open("r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json_file(USER_PRESETS_PATH)
         if isinstance(data, dict) and isinstance(data.get("presets"), list):
             return data
         if isinstance(data, list):
@@ -98,8 +255,8 @@ def save_user_presets(data: Dict[str, Any]) -> None:
             data = {"presets": []}
         if "presets" not in data or not isinstance(data["presets"], list):
             data["presets"] = []
-        with USER_PRESETS_PATH.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        with _USER_PRESETS_LOCK:
+            _write_json_file(USER_PRESETS_PATH, data)
     except Exception as e:
         print(f"[AceForge] Failed to save user_presets.json: {e}", flush=True)
 
@@ -122,16 +279,87 @@ def get_audio_duration(path: Path) -> float:
         return 0.0
 
 
+# File types shown in the track list
+_TRACK_SUFFIXES = (".wav", ".mp3", ".mid")
+
+# Last scan of the output directory, reused while the directory's own mtime is
+# unchanged (adding, removing or renaming a track always bumps it).
+_TRACK_SCAN_LOCK = threading.Lock()
+_TRACK_SCAN_CACHE: Dict[str, Any] = {"key": None, "mtimes": {}}
+# A directory modified this recently can still change within the same mtime
+# tick on coarse-timestamp filesystems (FAT/exFAT: 2 s), so don't reuse it yet
+_SCAN_SETTLE_SECONDS = 2.0
+
+# Durations by path, with the (mtime_ns, size) they were measured at: decoding
+# a file with pydub is far more expensive than anything else /tracks.json does.
+# Pruned to the files of the latest scan, so it never outgrows the track list.
+_DURATION_CACHE: Dict[str, Tuple[int, int, float]] = {}
+
+
+def _scan_music_dir(music_dir: Path) -> Dict[str, float]:
+    """
+    Return {file name: mtime} for the track files in `music_dir`.
+    The returned dict is shared with the cache; callers must not modify it.
+    """
+    try:
+        dir_st = music_dir.stat()
+    except OSError:
+        return {}
+    key = (str(music_dir), dir_st.st_mtime_ns)
+    with _TRACK_SCAN_LOCK:
+        if _TRACK_SCAN_CACHE["key"] == key:
+            return _TRACK_SCAN_CACHE["mtimes"]
+
+    mtimes: Dict[str, float] = {}
+    # scandir: no Path object per entry, and DirEntry.stat() is served from
+    # the directory listing on Windows (one stat per file on POSIX)
+    with os.scandir(music_dir) as it:
+        for entry in it:
+            if os.path.splitext(entry.name)[1].lower() not in _TRACK_SUFFIXES:
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                mtimes[entry.name] = st.st_mtime
+
+    settled = time.time() - dir_st.st_mtime > _SCAN_SETTLE_SECONDS
+    live = {os.path.join(key[0], name) for name in mtimes}
+    with _TRACK_SCAN_LOCK:
+        _TRACK_SCAN_CACHE["key"] = key if settled else None
+        _TRACK_SCAN_CACHE["mtimes"] = mtimes
+        for stale in [p for p in _DURATION_CACHE if p not in live]:
+            del _DURATION_CACHE[stale]
+    return mtimes
+
+
+def get_cached_audio_duration(path: Path) -> float:
+    """
+    get_audio_duration(), remembered until the file's mtime or size changes.
+    The file is stat'ed here rather than trusting the directory scan, which
+    can't see a file being rewritten or appended to in place.
+    """
+    key = os.fspath(path)
+    try:
+        st = os.stat(key)
+    except OSError:
+        return 0.0
+    cached = _DURATION_CACHE.get(key)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+    seconds = get_audio_duration(path)
+    # A file modified this recently may still be being written
+    if time.time() - st.st_mtime > _SCAN_SETTLE_SECONDS:
+        with _TRACK_SCAN_LOCK:
+            _DURATION_CACHE[key] = (st.st_mtime_ns, st.st_size, seconds)
+    return seconds
+
+
 def list_music_files() -> List[str]:
     """Return a sorted list of .wav, .mp3, and .mid files in the configured output directory."""
     music_dir = Path(get_output_dir())
-    if not music_dir.exists():
-        return []
-    names = [
-        p.name for p in music_dir.iterdir()
-        if p.is_file() and p.suffix.lower() in (".wav", ".mp3", ".mid")
-    ]
-    return sorted(names, key=lambda n: n.lower())
+    return sorted(_scan_music_dir(music_dir), key=lambda n: n.lower())
 
 
 def list_lora_adapters() -> List[Dict[str, Any]]:
@@ -179,6 +407,12 @@ def list_lora_adapters() -> List[Dict[str, Any]]:
 # Blueprint and routes
 # ---------------------------------------------------------------------------
 
+# /progress/stream: minimum gap between events (bursts of updates coalesce),
+# and the idle keep-alive period
+PROGRESS_STREAM_INTERVAL = 0.05
+PROGRESS_STREAM_KEEPALIVE = 15.0
+
+
 def create_tracks_blueprint() -> Blueprint:
     bp = Blueprint("cdmf_tracks", __name__)
 
@@ -187,15 +421,13 @@ def create_tracks_blueprint() -> Blueprint:
         """Serve audio files from the AceForge music directory."""
         return send_from_directory(get_output_dir(), filename)
 
-    @bp.route("/progress", methods=["GET"])
-    def get_progress():
-        """Return current generation progress as JSON for the front-end progress bar."""
-        with cdmf_state.PROGRESS_LOCK:
-            current = cdmf_state.GENERATION_PROGRESS["current"]
-            total = cdmf_state.GENERATION_PROGRESS["total"] or 0.0
-            done = cdmf_state.GENERATION_PROGRESS["done"]
-            error = cdmf_state.GENERATION_PROGRESS["error"]
-            stage = cdmf_state.GENERATION_PROGRESS["stage"]
+    def _progress_payload() -> Dict[str, Any]:
+        progress = cdmf_state.get_progress_snapshot()
+        current = progress["current"]
+        total = progress["total"] or 0.0
+        done = progress["done"]
+        error = progress["error"]
+        stage = progress["stage"]
 
         if error:
             fraction = 0.0
@@ -212,16 +444,57 @@ def create_tracks_blueprint() -> Blueprint:
         else:
             fraction = 0.0
 
-        return jsonify(
-            {
-                "current": current,
-                "total": total,
-                "fraction": fraction,
-                "done": done,
-                "error": error,
-                "stage": stage,
-            }
-        )
+        return {
+            "current": current,
+            "total": total,
+            "fraction": fraction,
+            "done": done,
+            "error": error,
+            "stage": stage,
+        }
+
+    @bp.route("/progress", methods=["GET"])
+    def get_progress():
+        """Return current generation progress as JSON for the front-end progress bar."""
+        return jsonify(_progress_payload())
+
+    @bp.route("/progress/stream", methods=["GET"])
+    def stream_progress():
+        """
+        Server-Sent Events version of /progress: one event (same JSON) each
+        time the progress changes, instead of the client polling on a timer.
+        """
+        def generate():
+            last = None
+            last_write = time.monotonic()
+            version = cdmf_state.progress_version()
+            while True:
+                progress = _progress_payload()
+                payload = json.dumps(progress)
+                if payload != last:
+                    last = payload
+                    yield f"data: {payload}\n\n"
+                    if progress["done"] or progress["error"]:
+                        # Nothing further to report: free the worker thread
+                        return
+                    last_write = time.monotonic()
+                    time.sleep(PROGRESS_STREAM_INTERVAL)
+                elif time.monotonic() - last_write >= PROGRESS_STREAM_KEEPALIVE:
+                    # Also lets the server notice a client that went away
+                    yield ": keep-alive\n\n"
+                    last_write = time.monotonic()
+                # Sleep until progress_update() changes the progress (version read
+                # before the snapshot, so a change in between isn't missed)
+                idle = time.monotonic() - last_write
+                version = cdmf_state.wait_for_progress_change(
+                    version, max(0.0, PROGRESS_STREAM_KEEPALIVE - idle)
+                )
+
+        return Response(generate(), mimetype="text/event-stream",
+                        headers={
+                            "Cache-Control": "no-cache",
+                            "X-Accel-Buffering": "no",
+                        })
 
     @bp.route("/tracks.json", methods=["GET"])
     def tracks_json():
@@ -229,43 +502,29 @@ def create_tracks_blueprint() -> Blueprint:
         JSON list of available .wav and .mp3 tracks plus the most recently generated one
         (if known). Used by the front-end after a generation finishes.
         """
-        tracks = list_music_files()
-        meta = load_track_meta()
-
         music_dir = Path(get_output_dir())
+        # One (cached) directory scan gives both the names and their mtimes
+        mtimes = _scan_music_dir(music_dir)
+        tracks = sorted(mtimes, key=lambda n: n.lower())
+        meta = load_track_meta()
 
         # Prefer the last generated track, if it's in the list
         with cdmf_state.PROGRESS_LOCK:
             last = cdmf_state.LAST_GENERATED_TRACK
 
         current = None
-        latest_name = None
-        latest_mtime = None
-        mtimes: Dict[str, float] = {}
-
         if tracks:
-            for name in tracks:
-                p = music_dir / name
-                try:
-                    mtime = p.stat().st_mtime
-                except OSError:
-                    continue
-                mtimes[name] = mtime
-                if latest_mtime is None or mtime > latest_mtime:
-                    latest_mtime = mtime
-                    latest_name = name
-
-            if last and last in tracks:
+            if last and last in mtimes:
                 current = last
             else:
-                current = latest_name or tracks[-1]
+                current = max(tracks, key=mtimes.__getitem__)
 
         track_items = []
         for name in tracks:
             info = meta.get(name, {})
             seconds_val = float(info.get("seconds") or 0.0)
             if seconds_val <= 0:
-                seconds_val = get_audio_duration(music_dir / name)
+                seconds_val = get_cached_audio_duration(music_dir / name)
             track_items.append(
                 {
                     "name": name,
@@ -315,16 +574,15 @@ def create_tracks_blueprint() -> Blueprint:
         if not track_path.is_file():
             return jsonify({"error": "Track not found"}), 404
 
-        meta = load_track_meta()
-        entry = meta.get(name, {})
+        with update_track_meta() as meta:
+            entry = meta.get(name, {})
 
-        if "favorite" in payload:
-            entry["favorite"] = bool(payload["favorite"])
-        if "category" in payload:
-            entry["category"] = str(payload["category"] or "").strip()
+            if "favorite" in payload:
+                entry["favorite"] = bool(payload["favorite"])
+            if "category" in payload:
+                entry["category"] = str(payload["category"] or "").strip()
 
-        meta[name] = entry
-        save_track_meta(meta)
+            meta[name] = entry
 
         return jsonify({"ok": True, "meta": entry})
 
@@ -352,45 +610,46 @@ def create_tracks_blueprint() -> Blueprint:
         payload = request.get_json(silent=True) or {}
         mode = (payload.get("mode") or "save").strip().lower()
 
-        data = load_user_presets()
-        presets = data.get("presets", [])
+        with _USER_PRESETS_LOCK:
+            data = load_user_presets()
+            presets = data.get("presets", [])
+
+            if mode == "delete":
+                pid = (payload.get("id") or "").strip()
+                if not pid:
+                    return jsonify({"error": "Missing preset id"}), 400
+                presets = [p for p in presets if str(p.get("id")) != pid]
+                data["presets"] = presets
+                save_user_presets(data)
+                return jsonify({"ok": True})
+
+            # Default: save / upsert
+            label = (payload.get("label") or "").strip()
+            settings = payload.get("settings") or {}
+            if not label:
+                return jsonify({"error": "Preset label is required"}), 400
 
-        if mode == "delete":
             pid = (payload.get("id") or "").strip()
             if not pid:
-                return jsonify({"error": "Missing preset id"}), 400
-            presets = [p for p in presets if str(p.get("id")) != pid]
+                pid = f"u_{int(time.time() * 1000)}"
+
+            # Upsert by id
+            found = False
+            for p in presets:
+                if str(p.get("id")) == pid:
+                    p["label"] = label
+                    p.update(settings or {})
+                    found = True
+                    break
+
+            if not found:
+                preset = {"id": pid, "label": label}
+                preset.update(settings or {})
+                presets.append(preset)
+
             data["presets"] = presets
             save_user_presets(data)
-            return jsonify({"ok": True})
-
-        # Default: save / upsert
-        label = (payload.get("label") or "").strip()
-        settings = payload.get("settings") or {}
-        if not label:
-            return jsonify({"error": "Preset label is required"}), 400
-
-        pid = (payload.get("id") or "").strip()
-        if not pid:
-            pid = f"u_{int(time.time() * 1000)}"
-
-        # Upsert by id
-        found = False
-        for p in presets:
-            if str(p.get("id")) == pid:
-                p["label"] = label
-                p.update(settings or {})
-                found = True
-                break
-
-        if not found:
-            preset = {"id": pid, "label": label}
-            preset.update(settings or {})
-            presets.append(preset)
-
-        data["presets"] = presets
-        save_user_presets(data)
-        return jsonify({"ok": True, "preset": {"id": pid, "label": label}})
+            return jsonify({"ok": True, "preset": {"id": pid, "label": label}})
 
     @bp.route("/tracks/rename", methods=["POST"])
     def rename_track():
@@ -432,14 +691,13 @@ def create_tracks_blueprint() -> Blueprint:
         except OSError as e:
             return jsonify({"error": f"Failed to rename track: {e}"}), 500
 
-        meta = load_track_meta()
-        if old_path.name in meta:
-            entry = meta.pop(old_path.name)
-            # Keep basename aligned with the new file's base name
-            if isinstance(entry, dict):
-                entry["basename"] = new_base
-            meta[final_name] = entry
-            save_track_meta(meta)
+        with update_track_meta() as meta:
+            if old_path.name in meta:
+                entry = meta.pop(old_path.name)
+                # Keep basename aligned with the new file's base name
+                if isinstance(entry, dict):
+                    entry["basename"] = new_base
+                meta[final_name] = entry
 
         with cdmf_state.PROGRESS_LOCK:
             if cdmf_state.LAST_GENERATED_TRACK == old_path.name:
@@ -466,10 +724,8 @@ def create_tracks_blueprint() -> Blueprint:
         except OSError as e:
             return jsonify({"error": f"Failed to delete track: {e}"}), 500
 
-        meta = load_track_meta()
-        if name in meta:
+        with update_track_meta() as meta:
             meta.pop(name, None)
-            save_track_meta(meta)
 
         with cdmf_state.PROGRESS_LOCK:
             if cdmf_state.LAST_GENERATED_TRACK == name:
@@ -145,32 +145,31 @@ def create_voice_cloning_blueprint(html_template: str) -> Blueprint:
 
                     final_name = Path(result_path).name
                     dur = len(AudioSegment.from_file(str(result_path))) / 1000.0
-                    track_meta = cdmf_tracks.load_track_meta()
-                    entry = track_meta.get(final_name, {})
-                    if "favorite" not in entry:
-                        entry["favorite"] = False
-                    entry["seconds"] = dur
-                    entry["created"] = time.time()
-                    entry["generator"] = "tts"
-                    entry["basename"] = Path(final_name).stem
-                    entry["input_file"] = str(temp_ref_path)  # Full path to reference audio
-                    entry["text"] = text
-                    entry["language"] = language
-                    entry["temperature"] = temperature
-                    entry["length_penalty"] = length_penalty
-                    entry["repetition_penalty"] = repetition_penalty
-                    entry["top_k"] = top_k
-                    entry["top_p"] = top_p
-                    entry["speed"] = speed
-                    entry["enable_text_splitting"] = enable_text_splitting
-                    entry["device_preference"] = device_preference
-                    entry["out_dir"] = str(out_dir_path)
-                    tags = list(entry.get("tags") or [])
-                    if "voice_cloning" not in tags:
-                        tags.append("voice_cloning")
-                    entry["tags"] = tags
-                    track_meta[final_name] = entry
-                    cdmf_tracks.save_track_meta(track_meta)
+                    with cdmf_tracks.update_track_meta() as track_meta:
+                        entry = track_meta.get(final_name, {})
+                        if "favorite" not in entry:
+                            entry["favorite"] = False
+                        entry["seconds"] = dur
+                        entry["created"] = time.time()
+                        entry["generator"] = "tts"
+                        entry["basename"] = Path(final_name).stem
+                        entry["input_file"] = str(temp_ref_path)  # Full path to reference audio
+                        entry["text"] = text
+                        entry["language"] = language
+                        entry["temperature"] = temperature
+                        entry["length_penalty"] = length_penalty
+                        entry["repetition_penalty"] = repetition_penalty
+                        entry["top_k"] = top_k
+                        entry["top_p"] = top_p
+                        entry["speed"] = speed
+                        entry["enable_text_splitting"] = enable_text_splitting
+                        entry["device_preference"] = device_preference
+                        entry["out_dir"] = str(out_dir_path)
+                        tags = list(entry.get("tags") or [])
+                        if "voice_cloning" not in tags:
+                            tags.append("voice_cloning")
+                        entry["tags"] = tags
+                        track_meta[final_name] = entry
                 except Exception as e:
                     from cdmf_ffmpeg import FFMPEG_INSTALL_HINT, is_ffmpeg_not_found_error
 
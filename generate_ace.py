@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import atexit
 import os
 import sys
 import random
@@ -17,17 +18,10 @@ os.environ.setdefault("HF_HUB_DISABLE_SYMLINKS", "1")
 # ---------------------------------------------------------------------------
 try:
     import lzma
-    import _lzma  # C extension - ensure it's loaded
-    # Test that lzma is functional (critical for py3langid in LangSegment)
-    _lzma_test_data = b"test_lzma_init"
-    _lzma_compressed = lzma.compress(_lzma_test_data)
-    _lzma_decompressed = lzma.decompress(_lzma_compressed)
-    if _lzma_decompressed == _lzma_test_data:
-        # Only print in frozen apps to avoid cluttering CI logs
-        if getattr(sys, 'frozen', False):
-            print("[generate_ace] lzma module initialized successfully (required for py3langid).", flush=True)
-    else:
-        print("[generate_ace] WARNING: lzma module test failed.", flush=True)
+    import _lzma  # C extension - ensure it's loaded (the import is the test)
+    # Only print in frozen apps to avoid cluttering CI logs
+    if getattr(sys, 'frozen', False):
+        print("[generate_ace] lzma module initialized successfully (required for py3langid).", flush=True)
 except ImportError as e:
     print(f"[generate_ace] WARNING: Failed to import lzma module: {e}", flush=True)
     print("[generate_ace] Language detection (py3langid) may fail.", flush=True)
@@ -35,7 +29,7 @@ except Exception as e:
     print(f"[generate_ace] WARNING: lzma module initialization error: {e}", flush=True)
 
 from pydub import AudioSegment
-from ace_model_setup import ensure_ace_models
+from ace_model_setup import ensure_ace_models, warm_page_cache
 
 # ---------------------------------------------------------------------------
 #  Torchaudio → WAV shim (bypass torchcodec / FFmpeg issues)
@@ -164,16 +158,31 @@ except Exception as _ta_err:
     # in which case you'll still see the torchcodec error.
     pass
 
-# ACE-Step pipeline (using cdmf_pipeline_ace_step.py)
-_ACE_IMPORT_ERROR = None  # <-- MUST exist before the try
+# ACE-Step pipeline (using cdmf_pipeline_ace_step.py). Imported on first use:
+# it pulls in ace-step, diffusers and transformers, which the UI doesn't need
+# until the first generation.
+ACEStepPipeline = None  # type: ignore[assignment]
+_ACE_IMPORT_ERROR = None
+_ACE_IMPORT_ATTEMPTED = False
+_ACE_IMPORT_LOCK = threading.Lock()
 
-try:
-    from cdmf_pipeline_ace_step import ACEStepPipeline
-except Exception as e:  # import-time diagnostics only
-    ACEStepPipeline = None  # type: ignore[assignment]
-    _ACE_IMPORT_ERROR = e
-    # Print import error immediately for debugging frozen apps
-    print(f"[ACE] WARNING: Failed to import ACEStepPipeline: {type(e).__name__}: {e}", flush=True)
+
+def _load_ace_pipeline_class():
+    """Import ACEStepPipeline once; returns None (and records the error) on failure."""
+    global ACEStepPipeline, _ACE_IMPORT_ERROR, _ACE_IMPORT_ATTEMPTED
+
+    with _ACE_IMPORT_LOCK:
+        if not _ACE_IMPORT_ATTEMPTED:
+            _ACE_IMPORT_ATTEMPTED = True
+            try:
+                from cdmf_pipeline_ace_step import ACEStepPipeline as pipeline_cls
+            except Exception as e:
+                _ACE_IMPORT_ERROR = e
+                # Print import error immediately for debugging frozen apps
+                print(f"[ACE] WARNING: Failed to import ACEStepPipeline: {type(e).__name__}: {e}", flush=True)
+            else:
+                ACEStepPipeline = pipeline_cls
+    return ACEStepPipeline
 
 # -----------------------------------------------------------------------------
 #  Basic config
@@ -274,6 +283,18 @@ _ACE_PIPELINE: Optional["ACEStepPipeline"] = None
 _ACE_PIPELINE_LOCK = threading.Lock()
 _ACE_GENERATION_LOCK = threading.Lock()
 
+# devnull stream the frozen app's tqdm bars draw to; opened once, closed at exit
+_CONSOLE_SINK = None
+
+
+def _get_console_sink():
+    global _CONSOLE_SINK
+    if _CONSOLE_SINK is None:
+        _CONSOLE_SINK = open(os.devnull, "w")
+        atexit.register(_CONSOLE_SINK.close)
+    return _CONSOLE_SINK
+
+
 def _monkeypatch_ace_tqdm() -> None:
     """
     Patch ACE-Step's internal `tqdm` so its diffusion/decoding loops
@@ -281,6 +302,10 @@ def _monkeypatch_ace_tqdm() -> None:
 
     This makes the front-end progress bar track *actual* backend work
     instead of just a couple of coarse jumps.
+
+    In the frozen app stderr is the console log, where every bar redraw
+    would be parsed back out of text; there the bars are drawn to devnull
+    and a "[Progress]" line is printed from the numbers we already have.
     """
     if ACEStepPipeline is None:
         return
@@ -296,6 +321,7 @@ def _monkeypatch_ace_tqdm() -> None:
         return
 
     orig_tqdm = ace_mod.tqdm
+    console_sink = _get_console_sink() if getattr(sys, "frozen", False) else None
 
     # Map ACE internal function names → (global_progress_start, global_progress_end)
     # These ranges sit inside [0.0, 1.0] for the overall job.
@@ -343,6 +369,8 @@ def _monkeypatch_ace_tqdm() -> None:
             except Exception:
                 total = None
 
+        if console_sink is not None:
+            kwargs.setdefault("file", console_sink)
         inner = orig_tqdm(iterable, *args, **kwargs)
 
         def generator():
@@ -350,6 +378,7 @@ def _monkeypatch_ace_tqdm() -> None:
             span = max(0.0, float(end) - float(start))
             idx = 0
             denom = float(total) if total else None
+            last_pct = None
 
             for item in inner:
                 idx += 1
@@ -377,6 +406,19 @@ def _monkeypatch_ace_tqdm() -> None:
                         )
                     except Exception:
                         pass
+                    if console_sink is not None:
+                        pct = int(frac_local * 100)
+                        if pct != last_pct:
+                            last_pct = pct
+                            try:
+                                elapsed = int(inner.format_dict.get("elapsed") or 0)
+                                print(
+                                    f"[Progress] {pct}% ({idx}/{int(denom)} steps) - "
+                                    f"{elapsed // 60:02d}:{elapsed % 60:02d}",
+                                    flush=True,
+                                )
+                            except Exception:
+                                pass
                 yield item
 
         return generator()
@@ -398,7 +440,7 @@ def _get_ace_pipeline() -> "ACEStepPipeline":
     if _ACE_PIPELINE is not None:
         return _ACE_PIPELINE
 
-    if ACEStepPipeline is None:
+    if _load_ace_pipeline_class() is None:
         # Check if running as frozen app (macOS .app bundle)
         is_frozen = getattr(sys, 'frozen', False)
         
@@ -452,6 +494,10 @@ def _get_ace_pipeline() -> "ACEStepPipeline":
                 "See the console logs above for details."
             ) from exc
 
+        # Prefetch the shards into the page cache in parallel; the pipeline
+        # itself loads them one after another.
+        warm_page_cache(checkpoint_root)
+
         # Wire ACE's internal progress bars into our callback before heavy work starts.
         _monkeypatch_ace_tqdm()
 
@@ -6,10 +6,14 @@ from pathlib import Path
 import sys
 import os
 import threading
+import collections
 import queue
+import atexit
 import logging
+import logging.handlers
 import time
 import re
+import traceback
 import socket
 import webbrowser
 from io import StringIO
@@ -33,19 +37,9 @@ from flask import Flask, Response, request, send_from_directory
 # might not be properly initialized if imported lazily
 try:
     import lzma
-    import _lzma  # C extension - ensure it's loaded
-    # Test that lzma actually works
-    try:
-        # Quick test to ensure lzma is functional
-        test_data = b"test"
-        compressed = lzma.compress(test_data)
-        decompressed = lzma.decompress(compressed)
-        if decompressed == test_data:
-            print("[AceForge] lzma module initialized successfully for py3langid.", flush=True)
-        else:
-            print("[AceForge] WARNING: lzma module test failed.", flush=True)
-    except Exception as e:
-        print(f"[AceForge] WARNING: lzma module test failed: {e}", flush=True)
+    import _lzma  # C extension - ensure it's loaded (the import is the test)
+    if getattr(sys, "frozen", False):
+        print("[AceForge] lzma module initialized successfully for py3langid.", flush=True)
 except ImportError as e:
     print(f"[AceForge] WARNING: Failed to import lzma module: {e}", flush=True)
     print("[AceForge] Language detection may fail in frozen app.", flush=True)
@@ -202,74 +196,187 @@ _MUSIC_FORGE_UI_IMPORTED = True
 # Log streaming infrastructure
 # ---------------------------------------------------------------------------
 
-# Queue to hold log messages for streaming to browser
-LOG_QUEUE = queue.Queue(maxsize=1000)
+# Ring buffer of log messages for streaming to browser. deque append/popleft
+# are atomic, so producers take no lock; when full the oldest line is dropped.
+LOG_BUFFER = collections.deque(maxlen=1000)
+# Set when LOG_BUFFER has new lines; the streamer clears it before waiting
+LOG_READY = threading.Event()
+# Max log lines sent per /logs/stream write
+LOG_STREAM_BATCH = 128
+# Separator that frames a drained batch as consecutive SSE events in one join
+_SSE_EVENT_SEP = "\n\ndata: "
+
+
+# Number of /logs/stream clients connected. With none, records are not
+# formatted; the most recent raw ones wait in _LOG_BACKLOG for the next client.
+_LOG_CLIENTS = 0
+_LOG_CLIENTS_LOCK = threading.Lock()
+# Same depth as LOG_BUFFER, so a client attaching late still gets the whole boot log
+_LOG_BACKLOG = collections.deque(maxlen=LOG_BUFFER.maxlen)
+
+
+def _attach_log_client():
+    """Register a log stream client; the first one replays the backlog."""
+    global _LOG_CLIENTS
+    # Take the backlog in the same critical section as the count change:
+    # emit() re-checks the count under this lock before parking a record, so
+    # nothing can land in the backlog after it has been handed over.
+    # The records are handled outside the lock (handle() takes the handler's
+    # own lock, which emit() already holds when it takes this one).
+    with _LOG_CLIENTS_LOCK:
+        _LOG_CLIENTS += 1
+        backlog = list(_LOG_BACKLOG) if _LOG_CLIENTS == 1 else []
+        _LOG_BACKLOG.clear()
+    for record in backlog:
+        log_handler.handle(record)
+
+
+def _detach_log_client():
+    global _LOG_CLIENTS
+    with _LOG_CLIENTS_LOCK:
+        _LOG_CLIENTS -= 1
+
+
+def _drain_log_buffer(limit):
+    """Pop up to `limit` buffered log lines, oldest first."""
+    batch = []
+    try:
+        while len(batch) < limit:
+            batch.append(LOG_BUFFER.popleft())
+    except IndexError:
+        pass
+    return batch
+
+# Log lines dropped from the console stream (matched case-insensitively)
+_LOG_FILTER_PHRASES = (
+    'task queue depth',                   # waitress thread-pool warnings
+    'client disconnected while serving',  # too noisy
+)
+
+# tqdm progress bar: " 50%|#####     | 35/70 [05:13<00:52,  1.50s/it]"
+_PROGRESS_RE = re.compile(r'(\d+)%\s*\|\s*[#\s]+\|\s*(\d+)/(\d+)\s+\[([^\]]+)\]')
+
 
-class QueueHandler(logging.Handler):
-    """Custom logging handler that puts messages into a queue for streaming"""
+def _is_filtered_log(text):
+    """True if `text` is one of the noisy lines we never stream."""
+    text_lower = text.lower()
+    return any(phrase in text_lower for phrase in _LOG_FILTER_PHRASES)
+
+
+class LogStreamHandler(logging.Handler):
+    """Custom logging handler that puts messages into LOG_BUFFER for streaming"""
     def emit(self, record):
         try:
+            if not _LOG_CLIENTS:
+                if record.exc_info:
+                    # Render the traceback now (cached as exc_text) so the
+                    # backlog doesn't keep its frames and their locals alive
+                    self.format(record)
+                    record.exc_info = None
+                with _LOG_CLIENTS_LOCK:
+                    # Re-check: a client may have attached (and taken the
+                    # backlog) since the unlocked test above
+                    if not _LOG_CLIENTS:
+                        # Nobody is watching: keep the raw record for the next
+                        # client instead of formatting a line that may never be sent
+                        _LOG_BACKLOG.append(record)
+                        return
+            
             msg = self.format(record)
             
             # Additional filtering at the handler level
-            msg_lower = msg.lower()
-            
-            # Filter out task queue warnings
-            if 'task queue depth' in msg_lower:
-                return
-            
-            # Filter out client disconnect messages
-            if 'client disconnected while serving' in msg_lower:
+            if _is_filtered_log(msg):
                 return
             
-            # Try to add to queue, drop if full
-            try:
-                LOG_QUEUE.put_nowait(msg)
-            except queue.Full:
-                pass  # Drop message if queue is full
+            LOG_BUFFER.append(msg)
+            # is_set() is lock-free; only pay for set() when the streamer is waiting
+            if not LOG_READY.is_set():
+                LOG_READY.set()
         except Exception:
             self.handleError(record)
 
-# Set up logging to capture stdout/stderr AND put into queue
-log_handler = QueueHandler()
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueue records untouched. The stock prepare() formats the message on the
+    calling thread so records can be pickled; ours never leave the process,
+    so formatting is left to the listener thread.
+    """
+    def prepare(self, record):
+        return record
+
+class _SecondCachedFormatter(logging.Formatter):
+    """
+    Formatter that renders asctime once per second. With a datefmt that has
+    no sub-second fields, every record in a burst gets the same string.
+    """
+    _last_sec = None
+    _last_str = ''
+
+    def formatTime(self, record, datefmt=None):
+        if not datefmt:
+            # The default format includes milliseconds
+            return super().formatTime(record, datefmt)
+        sec = int(record.created)
+        if sec != self._last_sec:
+            # String first, so a reader that sees the new second gets its text
+            self._last_str = super().formatTime(record, datefmt)
+            self._last_sec = sec
+        return self._last_str
+
+# Set up logging to capture stdout/stderr AND put into LOG_BUFFER
+log_handler = LogStreamHandler()
 log_handler.setLevel(logging.INFO)
-formatter = logging.Formatter('[%(asctime)s] %(levelname)s: %(message)s', 
-                              datefmt='%Y-%m-%d %H:%M:%S')
+formatter = _SecondCachedFormatter('[%(asctime)s] %(levelname)s: %(message)s', 
+                                   datefmt='%Y-%m-%d %H:%M:%S')
 log_handler.setFormatter(formatter)
 
+# Logging threads (generation loop, request workers, redirected stdout) only
+# enqueue the record; formatting and filtering run on the listener's thread.
+_log_record_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(
+    _log_record_queue, log_handler, respect_handler_level=True
+)
+log_listener.start()
+# Flush records still queued at interpreter exit
+atexit.register(log_listener.stop)
+
 # Get root logger and add our handler
 root_logger = logging.getLogger()
-root_logger.addHandler(log_handler)
+root_logger.addHandler(_InProcessQueueHandler(_log_record_queue))
 root_logger.setLevel(logging.INFO)
 
+# waitress.queue warns "Task queue depth is N" whenever all worker threads are
+# busy (e.g. the UI loading many assets). The handler drops those lines anyway,
+# so stop them at the logger before a record is built and formatted.
+logging.getLogger("waitress.queue").setLevel(logging.ERROR)
+
+# Model libraries log INFO chatter (weight loading, HTTP requests, font
+# caches) from inside the generation thread; only their warnings are useful
+# in the console, so don't build records for anything below that.
+for _noisy_logger in ("diffusers", "transformers", "huggingface_hub", "urllib3", "matplotlib", "PIL"):
+    logging.getLogger(_noisy_logger).setLevel(logging.WARNING)
+
 # Also redirect stdout and stderr to logging
 class StreamToLogger:
     """File-like object that redirects writes to a logger with filtering"""
     def __init__(self, logger, log_level=logging.INFO):
         self.logger = logger
         self.log_level = log_level
-        self.linebuf = ''
+        # Fragments of the current (unterminated) line; joined once it ends
+        self.linebuf = []
         self.last_progress = None  # Track last progress to avoid duplicates
 
     def _should_filter(self, line):
         """Filter out unwanted log messages"""
-        line_lower = line.lower()
-        
-        # Filter out task queue depth warnings
-        if 'task queue depth' in line_lower:
-            return True
-        
-        # Filter out client disconnect messages (too noisy)
-        if 'client disconnected while serving' in line_lower:
-            return True
-        
-        return False
+        return _is_filtered_log(line)
     
     def _extract_progress(self, line):
         """Extract progress bar information from tqdm output"""
-        # Match tqdm progress bar format: " 50%|#####     | 35/70 [05:13<00:52,  1.50s/it]"
-        progress_pattern = r'(\d+)%\s*\|\s*[#\s]+\|\s*(\d+)/(\d+)\s+\[([^\]]+)\]'
-        match = re.search(progress_pattern, line)
+        # Most lines aren't progress bars; two substring scans reject them
+        # without running the regex
+        if '%' not in line or '|' not in line:
+            return None
+        match = _PROGRESS_RE.search(line)
         
         if match:
             percent = int(match.group(1))
@@ -293,55 +400,49 @@ class StreamToLogger:
             pass
         return msg
 
-    def write(self, buf):
-        # Handle partial writes by buffering until we get a newline
-        temp_buf = self.linebuf + buf
-        lines = temp_buf.splitlines(keepends=True)
+    def _log_line(self, line_clean):
+        """Filter one complete, stripped line and log it (progress bars deduplicated)"""
+        if self._should_filter(line_clean):
+            return
         
-        # Process complete lines (those ending with newline)
-        for line in lines[:-1]:
-            if line.endswith(('\n', '\r\n', '\r')):
-                line_clean = line.rstrip()
-                
-                # Skip empty lines
-                if not line_clean:
-                    continue
-                
-                # Filter unwanted messages
-                if self._should_filter(line_clean):
-                    continue
-                
-                # Try to extract progress bar info
-                progress_msg = self._extract_progress(line_clean)
-                if progress_msg:
-                    # Only log if it's different from last progress (avoid duplicates)
-                    if progress_msg != self.last_progress:
-                        self.logger.log(logging.INFO, self._prefix_job_id(progress_msg))
-                        self.last_progress = progress_msg
-                    continue
-                
-                # Log other messages normally (with optional job id prefix)
-                self.logger.log(self.log_level, self._prefix_job_id(line_clean))
+        # Try to extract progress bar info
+        progress_msg = self._extract_progress(line_clean)
+        if progress_msg:
+            # Only log if it's different from last progress (avoid duplicates)
+            if progress_msg != self.last_progress:
+                self.logger.log(logging.INFO, self._prefix_job_id(progress_msg))
+                self.last_progress = progress_msg
+            return
         
-        # Keep any incomplete line in buffer
-        if lines and not lines[-1].endswith(('\n', '\r\n', '\r')):
-            self.linebuf = lines[-1]
-        else:
-            self.linebuf = ''
+        # Log other messages normally (with optional job id prefix)
+        self.logger.log(self.log_level, self._prefix_job_id(line_clean))
+
+    def write(self, buf):
+        # Handle partial writes by buffering until we get a newline. Only the
+        # new text is searched; the buffered fragments hold no terminator.
+        # Everything up to the last terminator is complete; tqdm redraws end in '\r'
+        idx = max(buf.rfind('\n'), buf.rfind('\r'))
+        if idx < 0:
+            if buf:
+                self.linebuf.append(buf)
+            return
+        data = ''.join(self.linebuf) + buf[:idx + 1] if self.linebuf else buf[:idx + 1]
+        tail = buf[idx + 1:]
+        self.linebuf = [tail] if tail else []
+        
+        for line in data.splitlines():
+            line_clean = line.rstrip()
+            # Skip empty lines
+            if line_clean:
+                self._log_line(line_clean)
     
     def flush(self):
         # Flush any remaining buffered content
         if self.linebuf:
-            line_clean = self.linebuf.rstrip()
-            if line_clean and not self._should_filter(line_clean):
-                progress_msg = self._extract_progress(line_clean)
-                if progress_msg:
-                    if progress_msg != self.last_progress:
-                        self.logger.log(logging.INFO, self._prefix_job_id(progress_msg))
-                        self.last_progress = progress_msg
-                else:
-                    self.logger.log(self.log_level, self._prefix_job_id(line_clean))
-            self.linebuf = ''
+            line_clean = ''.join(self.linebuf).rstrip()
+            if line_clean:
+                self._log_line(line_clean)
+            self.linebuf = []
 
 # Redirect stdout and stderr to logging (for frozen app)
 if getattr(sys, 'frozen', False):
@@ -416,7 +517,6 @@ except ImportError as e:
 # ---------------------------------------------------------------------------
 def _log_exception_and_return_response(error, status_code=500):
     """Log full traceback to root logger (so it appears in app console), then return response."""
-    import traceback
     tb = traceback.format_exc()
     logging.getLogger().error("[AceForge] Server error (%s):\n%s", status_code, tb)
     try:
@@ -540,16 +640,30 @@ def stream_logs():
         # Send initial connection message
         yield f"data: [System] Log streaming connected\n\n"
         
-        # Stream logs from the queue
+        _attach_log_client()
+        try:
+            yield from _stream_log_buffer()
+        finally:
+            _detach_log_client()
+    
+    def _stream_log_buffer():
+        # Stream logs from the buffer
         while True:
             try:
-                # Wait for a log message (timeout every 30 seconds for keep-alive)
-                msg = LOG_QUEUE.get(timeout=30)
-                # Send the log message as SSE
-                yield f"data: {msg}\n\n"
-            except queue.Empty:
-                # Send keep-alive comment
-                yield ": keep-alive\n\n"
+                if not LOG_BUFFER:
+                    # Clear, then re-check, so a line appended in between isn't missed
+                    LOG_READY.clear()
+                    # Wait for a log message (timeout every 30 seconds for keep-alive)
+                    if not LOG_BUFFER and not LOG_READY.wait(timeout=30):
+                        # Send keep-alive comment
+                        yield ": keep-alive\n\n"
+                        continue
+                # Take whatever is buffered so a burst goes out as one write
+                # instead of one per line
+                batch = _drain_log_buffer(LOG_STREAM_BATCH)
+                if batch:
+                    # Send the log messages as SSE (one event each)
+                    yield "data: " + _SSE_EVENT_SEP.join(batch) + "\n\n"
             except Exception as e:
                 yield f"data: [Error] Log streaming error: {e}\n\n"
                 break
@@ -783,6 +897,7 @@ def main() -> None:
             # Server control - use a shared reference to the server instance
             server_instance = None
             server_shutdown_event = threading.Event()
+            server_ready_event = threading.Event()
             
             # Start Flask server in a background thread using programmatic approach
             def start_server():
@@ -791,6 +906,8 @@ def main() -> None:
                 try:
                     # Create server instance for programmatic control
                     server_instance = create_server(app, host="127.0.0.1", port=5056)
+                    # create_server() has bound and is listening; the window can load now
+                    server_ready_event.set()
                     print("[AceForge] Server starting on http://127.0.0.1:5056", flush=True)
                     server_instance.run()
                 except Exception as e:
@@ -817,34 +934,19 @@ def main() -> None:
             def on_closed():
                 """Callback when window is closed - shutdown everything"""
                 print("[AceForge] Window closed by user, shutting down...", flush=True)
+                # Runs on the GUI thread: only stop the server here. Raising
+                # SystemExit through the backend's callback is not safe;
+                # webview.start() returns after the last window closes and
+                # main() exits from there.
                 shutdown_server()
-                # Brief pause to allow server.close() to complete gracefully
-                time.sleep(SERVER_SHUTDOWN_DELAY)
-                sys.exit(0)
             
             # Start server thread as daemon (will exit when main thread exits)
             # The server is stopped programmatically via server.close() in on_closed()
             server_thread = threading.Thread(target=start_server, daemon=True, name="FlaskServer")
             server_thread.start()
             
-            # Wait for server to be ready (simple check with socket)
-            max_wait = 5
-            waited = 0
-            server_ready = False
-            while waited < max_wait and not server_ready:
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(SOCKET_CHECK_TIMEOUT)
-                    result = sock.connect_ex(('127.0.0.1', 5056))
-                    sock.close()
-                    if result == 0:
-                        server_ready = True
-                        break
-                except Exception:
-                    # Socket check failed; continue waiting
-                    pass
-                time.sleep(0.2)
-                waited += 0.2
+            # Wait for server to be ready (set by start_server once the socket is listening)
+            server_ready = server_ready_event.wait(timeout=5)
             
             if not server_ready:
                 print("[AceForge] WARNING: Server may not be ready", flush=True)
@@ -899,8 +1001,10 @@ def main() -> None:
             # Pass _apply_webview_zoom so it runs in a separate thread after window is ready
             webview.start(_apply_webview_zoom, window, debug=False)
             
-            # This should not be reached (on_closed exits), but just in case
+            # Window closed: on_closed has already asked the server to stop
             shutdown_server()
+            # Brief pause to allow server.close() to complete gracefully
+            time.sleep(SERVER_SHUTDOWN_DELAY)
             sys.exit(0)
             
         except ImportError:
@@ -920,13 +1024,10 @@ def main() -> None:
             # Check if server is already running before starting a new one
             server_running = False
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(SOCKET_CHECK_TIMEOUT)
-                result = sock.connect_ex(('127.0.0.1', 5056))
-                sock.close()
-                server_running = (result == 0)
-            except Exception:
-                # Socket check failed; assume server not running
+                with socket.create_connection(('127.0.0.1', 5056), timeout=SOCKET_CHECK_TIMEOUT):
+                    server_running = True
+            except OSError:
+                # Connection refused or timed out; assume server not running
                 pass
             
             if server_running:
@@ -968,7 +1069,6 @@ if __name__ == "__main__":
     try:
         main()
     except Exception as e:
-        import traceback
         error_msg = (
             "[AceForge] FATAL ERROR during startup:\n"
             f"{traceback.format_exc()}\n"
@@ -981,10 +1081,14 @@ if __name__ == "__main__":
         # Log to a file if possible
         try:
             error_log = Path(__file__).parent / "error.log"
-            with error_log.open("a", encoding="utf-8") as f:
-                f.write(f"\n\n{'='*80}\n")
-                f.write(f"[{time.strftime('%Y-%m-%d %H:%M:%S')}]\n")
-                f.write(error_msg)
+            entry = (
+                f"\n\n{'='*80}\n"
+                f"[{time.strftime('%Y-%m-%d %H:%M:%S')}]\n"
+                f"{error_msg}"
+            )
+            # Unbuffered, single write so the traceback reaches disk before exit
+            with error_log.open("ab", buffering=0) as f:
+                f.write(entry.encode("utf-8", "replace"))
         except Exception:
             pass
         
@@ -0,0 +1,95 @@
+"""
+Tests for the classic UI index page rendered by the generation blueprint
+(named blueprint template, Flask template hooks, ETag revalidation).
+"""
+
+from __future__ import annotations
+
+import pytest
+
+UI_TEMPLATE = "AceForge {{ version }} presets={{ presets.presets|length }} {{ injected }}"
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """Flask app with only the generation blueprint; output and cache dirs under tmp_path."""
+    from flask import Flask
+
+    import cdmf_generation
+    import cdmf_tracks
+    (tmp_path / "out").mkdir()
+    monkeypatch.setattr(cdmf_generation, "get_user_data_dir", lambda: tmp_path)
+    monkeypatch.setattr(cdmf_generation, "get_output_dir", lambda: str(tmp_path / "out"))
+    monkeypatch.setattr(cdmf_tracks, "get_output_dir", lambda: str(tmp_path / "out"))
+    monkeypatch.setattr(cdmf_tracks, "load_presets", lambda: {"presets": [{"id": "a"}]})
+
+    flask_app = Flask(__name__)
+    flask_app.config["TESTING"] = True
+    flask_app.register_blueprint(
+        cdmf_generation.create_generation_blueprint(
+            html_template=UI_TEMPLATE,
+            ui_defaults={},
+            generate_track_ace=lambda **kwargs: {},
+        )
+    )
+
+    injected = {"injected": "from-context-processor"}
+    flask_app.config["INJECTED"] = injected
+
+    @flask_app.context_processor
+    def _inject():
+        return dict(injected)
+
+    return flask_app
+
+
+def test_index_runs_context_processors_and_signals(app):
+    from flask import template_rendered
+
+    rendered = []
+
+    def _record(sender, template, context, **extra):
+        rendered.append(context)
+
+    client = app.test_client()
+    with template_rendered.connected_to(_record, app):
+        r = client.get("/")
+        assert r.status_code == 200
+        assert b"from-context-processor" in r.data
+        assert len(rendered) == 1
+        assert rendered[0]["injected"] == "from-context-processor"
+        assert "version" in rendered[0]
+
+        # A changed context processor value is not served from the memo
+        app.config["INJECTED"]["injected"] = "changed"
+        r2 = client.get("/", headers={"If-None-Match": r.headers["ETag"]})
+    assert r2.status_code == 200
+    assert b"changed" in r2.data
+    assert r2.headers["ETag"] != r.headers["ETag"]
+    assert len(rendered) == 2
+    assert rendered[1]["injected"] == "changed"
+
+
+def test_index_etag_revalidation(app, monkeypatch):
+    import cdmf_tracks
+    client = app.test_client()
+
+    r1 = client.get("/")
+    assert r1.status_code == 200
+    etag = r1.headers["ETag"]
+    assert etag
+    assert r1.content_type.startswith("text/html")
+
+    # Same inputs: the browser's cached copy is still valid
+    r2 = client.get("/", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.data == b""
+
+    # A new preset changes the page, so the old ETag no longer matches
+    monkeypatch.setattr(
+        cdmf_tracks, "load_presets", lambda: {"presets": [{"id": "a"}, {"id": "b"}]}
+    )
+    r3 = client.get("/", headers={"If-None-Match": etag})
+    assert r3.status_code == 200
+    assert r3.headers["ETag"] != etag
+    assert b"presets=2" in r3.data
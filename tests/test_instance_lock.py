@@ -0,0 +1,48 @@
+"""
+Tests for the single-instance lock in aceforge_app (real file locks, temp HOME).
+"""
+
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pytest.importorskip("webview")
+
+
+@pytest.fixture
+def aceforge_app(tmp_path, monkeypatch):
+    """aceforge_app with Path.home() pointed at a temp dir and no lock held."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    import aceforge_app as module
+    module._release_instance_lock()
+    yield module
+    module._release_instance_lock()
+
+
+def test_second_acquire_fails_while_held(aceforge_app):
+    assert aceforge_app.acquire_instance_lock() is True
+    held_fd = aceforge_app._LOCK_FD
+    assert held_fd is not None
+    assert aceforge_app._LOCK_FILE.read_text().strip() == str(os.getpid())
+
+    # A second open of the lock file is a separate lock owner, like another instance
+    assert aceforge_app.acquire_instance_lock() is False
+    # The failed attempt must not drop the lock this process already holds
+    assert aceforge_app._LOCK_FD == held_fd
+
+
+def test_lock_released_on_cleanup(aceforge_app):
+    assert aceforge_app.acquire_instance_lock() is True
+    aceforge_app._release_instance_lock()
+    assert aceforge_app._LOCK_FD is None
+    # Releasing twice (atexit after an explicit release) is harmless
+    aceforge_app._release_instance_lock()
+
+    fd = os.open(str(aceforge_app._LOCK_FILE), os.O_RDWR)
+    try:
+        aceforge_app._try_lock_fd(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,75 @@
+"""
+Tests for the HuggingFace reachability probe in acestep15_downloader.model_downloader.
+socket.create_connection is replaced so no network access is needed.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from acestep15_downloader import model_downloader
+
+
+class _FakeSocket:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def probe(monkeypatch):
+    """Reset the probe cache and record every (address, timeout) passed to create_connection."""
+    calls = []
+    state = {"fail": False}
+
+    def _create_connection(address, timeout=None):
+        calls.append((address, timeout))
+        if state["fail"]:
+            raise OSError("unreachable")
+        return _FakeSocket()
+
+    monkeypatch.setattr(model_downloader.socket, "create_connection", _create_connection)
+    monkeypatch.setattr(model_downloader, "_hf_probe", {"t": 0.0, "v": None, "target": None})
+    monkeypatch.delenv("HF_HUB_OFFLINE", raising=False)
+    monkeypatch.delenv("HF_ENDPOINT", raising=False)
+    return calls, state
+
+
+def test_default_endpoint(probe):
+    calls, _state = probe
+    assert model_downloader._hf_reachable() is True
+    assert calls == [(("huggingface.co", 443), 1.5)]
+
+
+@pytest.mark.parametrize("value", ["1", "true", "YES", " on "])
+def test_offline_mode_skips_probe(probe, monkeypatch, value):
+    calls, _state = probe
+    monkeypatch.setenv("HF_HUB_OFFLINE", value)
+    assert model_downloader._hf_reachable() is False
+    assert calls == []
+
+
+def test_custom_endpoint_with_port(probe, monkeypatch):
+    calls, _state = probe
+    monkeypatch.setenv("HF_ENDPOINT", "https://hf-mirror.example.com:8443/api")
+    assert model_downloader._hf_reachable() is True
+    monkeypatch.setenv("HF_ENDPOINT", "http://mirror.local")
+    assert model_downloader._hf_reachable() is True
+    # A different endpoint is probed afresh rather than served from the cache
+    assert [address for address, _timeout in calls] == [
+        ("hf-mirror.example.com", 8443),
+        ("mirror.local", 80),
+    ]
+
+
+def test_result_cached_until_ttl_expires(probe):
+    calls, state = probe
+    state["fail"] = True
+    assert model_downloader._hf_reachable() is False
+    state["fail"] = False
+    # Within the TTL the failed result is reused without another connection
+    assert model_downloader._hf_reachable() is False
+    assert len(calls) == 1
+
+    model_downloader._hf_probe["t"] -= model_downloader._PROBE_TTL + 1
+    assert model_downloader._hf_reachable() is True
+    assert len(calls) == 2
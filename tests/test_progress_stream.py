@@ -0,0 +1,107 @@
+"""
+Tests for the /progress and /progress/stream endpoints of the tracks blueprint.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+
+import pytest
+
+
+@pytest.fixture
+def cdmf_state():
+    import cdmf_state
+    yield cdmf_state
+    cdmf_state.reset_progress()
+
+
+@pytest.fixture
+def client(cdmf_state):
+    from flask import Flask
+
+    from cdmf_tracks import create_tracks_blueprint
+    app = Flask(__name__)
+    app.register_blueprint(create_tracks_blueprint())
+    with app.test_client() as c:
+        yield c
+
+
+def _events(chunks):
+    return [json.loads(c[len(b"data: "):]) for c in chunks if c.startswith(b"data: ")]
+
+
+def test_progress_json(client, cdmf_state):
+    cdmf_state.ace_progress_callback(0.25, "ace_infer")
+    data = client.get("/progress").get_json()
+    assert data["fraction"] == 0.25
+    assert data["stage"] == "ace_infer"
+    assert data["done"] is False
+
+
+def test_stream_ends_after_completed_job(client, cdmf_state):
+    cdmf_state.mark_done()
+    r = client.get("/progress/stream", buffered=False)
+    assert r.mimetype == "text/event-stream"
+    # A finished job yields one event and then the generator returns
+    chunks = list(itertools.islice(r.response, 3))
+    r.close()
+    assert len(chunks) == 1
+    assert _events(chunks)[0]["done"] is True
+
+
+def test_stream_wakes_on_change_and_ends_on_error(client, cdmf_state):
+    cdmf_state.mark_running("stem_split")
+    r = client.get("/progress/stream", buffered=False)
+    it = iter(r.response)
+    first = _events([next(it)])[0]
+    assert first["done"] is False and first["stage"] == "stem_split"
+
+    def _finish():
+        time.sleep(0.2)
+        cdmf_state.ace_progress_callback(0.5, "stem_split")
+        time.sleep(0.2)
+        # Direct writers (as in the blueprints) wake the stream too
+        with cdmf_state.progress_update() as progress:
+            progress["error"] = True
+            progress["done"] = True
+
+    started = time.monotonic()
+    threading.Thread(target=_finish, daemon=True).start()
+    rest = list(itertools.islice(it, 5))
+    r.close()
+    # Woken by the writers, well before the keep-alive period
+    assert time.monotonic() - started < 5
+    events = _events(rest)
+    assert [e["fraction"] for e in events] == [0.5, 0.0]
+    assert events[-1]["error"] is True
+
+
+def test_reads_and_no_op_writes_do_not_wake_the_stream(client, cdmf_state, monkeypatch):
+    import cdmf_tracks
+    monkeypatch.setattr(cdmf_tracks, "PROGRESS_STREAM_KEEPALIVE", 0.5)
+    cdmf_state.mark_running("ace_infer")
+    seen = cdmf_state.progress_version()
+
+    # A reader holding the plain lock, a snapshot and an identical rewrite
+    with cdmf_state.PROGRESS_LOCK:
+        _ = cdmf_state.LAST_GENERATED_TRACK
+    cdmf_state.get_progress_snapshot()
+    cdmf_state.mark_running("ace_infer")
+    assert cdmf_state.progress_version() == seen
+    assert cdmf_state.wait_for_progress_change(seen, 0.05) == seen
+
+    r = client.get("/progress/stream", buffered=False)
+    it = iter(r.response)
+    assert _events([next(it)])[0]["stage"] == "ace_infer"
+    with cdmf_state.PROGRESS_LOCK:
+        cdmf_state.LAST_GENERATED_TRACK = cdmf_state.LAST_GENERATED_TRACK
+    # Nothing changed, so the next chunk is the keep-alive, not a data event
+    assert next(it) == b": keep-alive\n\n"
+    r.close()
+
+    cdmf_state.ace_progress_callback(0.5, "ace_infer")
+    assert cdmf_state.progress_version() != seen
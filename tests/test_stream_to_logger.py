@@ -0,0 +1,85 @@
+"""
+Tests for music_forge_ui.StreamToLogger, the stdout/stderr redirect used by the frozen app.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelno, record.getMessage()))
+
+
+@pytest.fixture
+def stream():
+    """A StreamToLogger on a private logger, plus the list of (level, message) it logged."""
+    from music_forge_ui import StreamToLogger
+    logger = logging.getLogger("test_stream_to_logger")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    handler = _ListHandler()
+    logger.addHandler(handler)
+    try:
+        yield StreamToLogger(logger, logging.WARNING), handler.records
+    finally:
+        logger.removeHandler(handler)
+
+
+def _messages(records):
+    return [msg for _level, msg in records]
+
+
+def test_partial_writes_are_joined(stream):
+    s, records = stream
+    s.write("hel")
+    s.write("lo wor")
+    assert records == []
+    s.write("ld\n")
+    assert _messages(records) == ["hello world"]
+
+
+def test_multi_line_write_logs_every_complete_line(stream):
+    s, records = stream
+    # The last complete line of a write is logged too, not held back
+    s.write("one\ntwo\n")
+    assert _messages(records) == ["one", "two"]
+    s.write("three\r\n\nfour\nfi")
+    assert _messages(records) == ["one", "two", "three", "four"]
+    assert all(level == logging.WARNING for level, _msg in records)
+
+
+def test_flush_logs_unterminated_tail(stream):
+    s, records = stream
+    s.write("first\npartial")
+    assert _messages(records) == ["first"]
+    s.flush()
+    assert _messages(records) == ["first", "partial"]
+    # Nothing buffered any more
+    s.flush()
+    assert _messages(records) == ["first", "partial"]
+
+
+def test_carriage_return_progress_lines(stream):
+    s, records = stream
+    bar = " 50%|#####     | 35/70 [05:13<00:52,  1.50s/it]"
+    s.write(bar + "\r")
+    s.write(bar + "\r")  # tqdm redraw of the same state
+    s.write(" 51%|#####     | 36/70 [05:14<00:51,  1.50s/it]\r")
+    assert records == [
+        (logging.INFO, "[Progress] 50% (35/70 steps) - 05:13<00:52,  1.50s/it"),
+        (logging.INFO, "[Progress] 51% (36/70 steps) - 05:14<00:51,  1.50s/it"),
+    ]
+
+
+def test_filtered_lines_are_dropped(stream):
+    s, records = stream
+    s.write("WARNING: Task queue depth is 3\nkept\n")
+    assert _messages(records) == ["kept"]
@@ -0,0 +1,179 @@
+"""
+Tests for the cached, coalesced track metadata store in cdmf_tracks.
+Real files under a temp dir; only the module's path/cache globals are redirected.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+
+@pytest.fixture
+def tracks(tmp_path, monkeypatch):
+    """cdmf_tracks with tracks_meta.json and the output dir under tmp_path and an empty cache."""
+    import cdmf_tracks
+    # Write out anything pending from earlier tests before redirecting the path
+    cdmf_tracks.flush_track_meta()
+    monkeypatch.setattr(cdmf_tracks, "TRACK_META_PATH", tmp_path / "tracks_meta.json")
+    monkeypatch.setattr(cdmf_tracks, "get_output_dir", lambda: str(tmp_path))
+    monkeypatch.setattr(cdmf_tracks, "_META_CACHE", {"mtime": None, "data": None, "dirty": False})
+    yield cdmf_tracks
+    cdmf_tracks.flush_track_meta()
+
+
+def _read_meta_file(tracks):
+    return json.loads(tracks.TRACK_META_PATH.read_text(encoding="utf-8"))
+
+
+def test_save_then_load_and_flush(tracks):
+    tracks.save_track_meta({"a.wav": {"favorite": True, "category": "demo"}})
+    # The pending state is visible before it reaches the disk
+    assert tracks.load_track_meta() == {"a.wav": {"favorite": True, "category": "demo"}}
+    tracks.flush_track_meta()
+    assert _read_meta_file(tracks) == {"a.wav": {"favorite": True, "category": "demo"}}
+
+
+def test_deferred_save_is_written(tracks):
+    tracks.save_track_meta({"a.wav": {"favorite": True}})
+    tracks.save_track_meta({"a.wav": {"favorite": False}})
+    deadline = time.time() + 5
+    while not tracks.TRACK_META_PATH.exists() and time.time() < deadline:
+        time.sleep(0.05)
+    assert _read_meta_file(tracks) == {"a.wav": {"favorite": False}}
+
+
+def test_reload_from_disk(tracks, monkeypatch):
+    tracks.save_track_meta({"b.mp3": {"seconds": 12.5}})
+    tracks.flush_track_meta()
+    monkeypatch.setattr(tracks, "_META_CACHE", {"mtime": None, "data": None, "dirty": False})
+    assert tracks.load_track_meta() == {"b.mp3": {"seconds": 12.5}}
+
+    # An external edit of the file is picked up (new mtime)
+    tracks.TRACK_META_PATH.write_text(json.dumps({"c.wav": {}}), encoding="utf-8")
+    st = tracks.TRACK_META_PATH.stat()
+    os.utime(tracks.TRACK_META_PATH, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert tracks.load_track_meta() == {"c.wav": {}}
+
+
+def test_loaded_meta_does_not_share_nested_values(tracks):
+    tracks.save_track_meta({"a.wav": {"settings": {"tags": ["lofi"]}}})
+    meta = tracks.load_track_meta()
+    meta["a.wav"]["settings"]["tags"].append("edited")
+    meta["a.wav"]["favorite"] = True
+    assert tracks.load_track_meta() == {"a.wav": {"settings": {"tags": ["lofi"]}}}
+
+
+def test_favorite_round_trip(tracks, tmp_path):
+    from flask import Flask
+    (tmp_path / "song.wav").write_bytes(b"RIFF")
+    app = Flask(__name__)
+    app.register_blueprint(tracks.create_tracks_blueprint())
+    client = app.test_client()
+
+    r = client.post("/tracks/meta", json={"name": "song.wav", "favorite": True})
+    assert r.status_code == 200
+    assert r.get_json()["meta"]["favorite"] is True
+
+    r = client.get("/tracks/meta", query_string={"name": "song.wav"})
+    assert r.status_code == 200
+    assert r.get_json()["meta"]["favorite"] is True
+
+    r = client.post("/tracks/meta", json={"name": "song.wav", "favorite": False})
+    assert r.status_code == 200
+    tracks.flush_track_meta()
+    assert _read_meta_file(tracks) == {"song.wav": {"favorite": False}}
+
+
+def test_cleanup_resources_flushes_pending_meta(tracks, monkeypatch):
+    pytest.importorskip("webview")
+    import aceforge_app
+    monkeypatch.setattr(aceforge_app, "_cleanup_done", False)
+
+    tracks.save_track_meta({"a.wav": {"category": "keep"}})
+    aceforge_app.cleanup_resources(final_exit=True)
+    assert _read_meta_file(tracks) == {"a.wav": {"category": "keep"}}
+
+
+def test_concurrent_json_writes_leave_one_whole_file(tracks, tmp_path):
+    import threading
+
+    path = tmp_path / "concurrent.json"
+    payloads = [{"writer": i, "data": list(range(2000))} for i in range(8)]
+    errors = []
+
+    def _write(data):
+        try:
+            for _ in range(10):
+                tracks._write_json_file(path, data)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=_write, args=(p,)) for p in payloads]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert json.loads(path.read_text(encoding="utf-8")) in payloads
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith("concurrent")] == ["concurrent.json"]
+
+
+def test_concurrent_user_preset_saves_are_all_kept(tracks, tmp_path, monkeypatch):
+    import threading
+
+    from flask import Flask
+
+    monkeypatch.setattr(tracks, "USER_PRESETS_PATH", tmp_path / "user_presets.json")
+    app = Flask(__name__)
+    app.register_blueprint(tracks.create_tracks_blueprint())
+
+    def _save(i):
+        with app.test_client() as client:
+            r = client.post("/user_presets", json={"id": f"p{i}", "label": f"Preset {i}"})
+            assert r.status_code == 200
+
+    threads = [threading.Thread(target=_save, args=(i,)) for i in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    saved = {p["id"] for p in tracks.load_user_presets()["presets"]}
+    assert saved == {f"p{i}" for i in range(10)}
+
+
+def test_concurrent_meta_posts_are_all_kept(tracks, tmp_path):
+    import threading
+
+    from flask import Flask
+
+    names = [f"song{i}.wav" for i in range(10)]
+    for name in names:
+        (tmp_path / name).write_bytes(b"RIFF")
+    app = Flask(__name__)
+    app.register_blueprint(tracks.create_tracks_blueprint())
+
+    def _favorite(name):
+        with app.test_client() as client:
+            r = client.post("/tracks/meta", json={"name": name, "favorite": True})
+            assert r.status_code == 200
+
+    threads = [threading.Thread(target=_favorite, args=(name,)) for name in names]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    tracks.flush_track_meta()
+    assert _read_meta_file(tracks) == {name: {"favorite": True} for name in names}
+
+
+def test_update_track_meta_discards_edits_on_error(tracks):
+    tracks.save_track_meta({"a.wav": {"favorite": False}})
+    with pytest.raises(RuntimeError):
+        with tracks.update_track_meta() as meta:
+            meta["a.wav"]["favorite"] = True
+            raise RuntimeError("abandoned")
+    assert tracks.load_track_meta() == {"a.wav": {"favorite": False}}
@@ -88,13 +88,10 @@ export const MidiPanel: React.FC<MidiPanelProps> = ({ onTracksUpdated }) => {
 
   useEffect(() => {
     if (!loading) return;
-    const t = setInterval(() => {
-      toolsApi.getProgress().then((p) => {
-        setProgress(p.fraction);
-        if (p.done || p.error) setLoading(false);
-      }).catch(() => {});
+    return toolsApi.subscribeProgress((p) => {
+      setProgress(p.fraction);
+      if (p.done || p.error) setLoading(false);
     }, POLL_INTERVAL_MS);
-    return () => clearInterval(t);
   }, [loading]);
 
   const handleDownloadModels = () => {
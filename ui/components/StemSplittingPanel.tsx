@@ -24,7 +24,6 @@ export const StemSplittingPanel: React.FC<StemSplittingPanelProps> = ({ onTracks
   const [modelState, setModelState] = useState('');
   const [modelMessage, setModelMessage] = useState('');
   const [modelDownloadProgress, setModelDownloadProgress] = useState<number | null>(null);
-  const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
   const modelPollRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
   useEffect(() => {
@@ -83,25 +82,10 @@ export const StemSplittingPanel: React.FC<StemSplittingPanelProps> = ({ onTracks
 
   useEffect(() => {
     if (!loading) return;
-    const poll = () => {
-      toolsApi.getProgress()
-        .then((p) => {
-          setProgress(p.fraction);
-          if (p.done || p.error) {
-            setLoading(false);
-            if (pollRef.current) {
-              clearInterval(pollRef.current);
-              pollRef.current = null;
-            }
-          }
-        })
-        .catch(() => {});
-    };
-    poll();
-    pollRef.current = setInterval(poll, POLL_INTERVAL_MS);
-    return () => {
-      if (pollRef.current) clearInterval(pollRef.current);
-    };
+    return toolsApi.subscribeProgress((p) => {
+      setProgress(p.fraction);
+      if (p.done || p.error) setLoading(false);
+    }, POLL_INTERVAL_MS);
   }, [loading]);
 
   const handleDownloadModels = () => {
@@ -612,6 +612,46 @@ export const toolsApi = {
   getProgress: (): Promise<ProgressResponse> =>
     fetchJson<ProgressResponse>('/progress'),
 
+  /**
+   * Receive progress from /progress/stream (pushed only when it changes).
+   * Falls back to polling /progress if the stream can't be opened.
+   * Returns a function that stops the updates.
+   */
+  subscribeProgress: (onUpdate: (p: ProgressResponse) => void, fallbackPollMs = 500): (() => void) => {
+    let timer: ReturnType<typeof setInterval> | null = null;
+    const startPolling = () => {
+      if (timer) return;
+      const poll = () => { toolsApi.getProgress().then(onUpdate).catch(() => {}); };
+      poll();
+      timer = setInterval(poll, fallbackPollMs);
+    };
+    const es = typeof EventSource !== 'undefined' ? new EventSource(`${API_BASE}/progress/stream`) : null;
+    if (es) {
+      es.onmessage = (event: MessageEvent) => {
+        let p: ProgressResponse;
+        try {
+          p = JSON.parse(event.data) as ProgressResponse;
+        } catch {
+          return; // ignore malformed event
+        }
+        // The server ends the stream after a done/error event; close first so
+        // that isn't reported as an error (and answered with polling)
+        if (p.done || p.error) es.close();
+        onUpdate(p);
+      };
+      es.onerror = () => {
+        es.close();
+        startPolling();
+      };
+    } else {
+      startPolling();
+    }
+    return () => {
+      es?.close();
+      if (timer) clearInterval(timer);
+    };
+  },
+
   // Training
   trainStatus: (): Promise<{ running?: boolean; paused?: boolean; progress?: number; current_step?: number; max_steps?: number; current_epoch?: number; max_epochs?: number; last_message?: string; returncode?: number }> =>
     fetchJson('/train_lora/status'),